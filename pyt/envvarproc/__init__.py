@@ -0,0 +1,17 @@
+# ----------------------------------------------------------------------------------------
+# envvarproc
+# Version:  ArcGIS 10.3.1 / Python 2.7.8 (also runs under Python 3.x)
+# Creation Date: 2026-10-17
+
+# Summary:
+# Array (numpy) implementations of the processing steps used by the
+# Environmental variables processing toolbox (Toolbox.pyt). Modules in this
+# package do not need arcpy, except arcpy_io, which converts between arcpy
+# rasters and numpy arrays, and summarize, the land cover summary run shared
+# by the land cover tools (both import arcpy only when called).
+# The NUMPY backends also run from the command line, without arcpy, on
+# GeoTIFF or .npy rasters (raster_io): python -m envvarproc --help (cli.py).
+
+# Dependencies:
+# numpy
+# ----------------------------------------------------------------------------------------
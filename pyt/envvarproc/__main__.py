@@ -0,0 +1,17 @@
+# ----------------------------------------------------------------------------------------
+# __main__.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# python -m envvarproc: command line runs without arcpy (see cli.py).
+
+# Dependencies:
+# numpy
+# ----------------------------------------------------------------------------------------
+
+import sys
+
+from envvarproc.cli import main
+
+sys.exit(main())
@@ -0,0 +1,173 @@
+# ----------------------------------------------------------------------------------------
+# arcpy_io.py
+# Version:  ArcGIS 10.3.1 / Python 2.7.8
+# Creation Date: 2026-10-17
+
+# Summary:
+# Conversion between arcpy rasters and numpy arrays for the array backend.
+# Arrays are float64 with NoData as NaN; a RasterRef keeps the georeference
+# needed to write an array back to a raster aligned with its source.
+
+# Dependencies:
+# arcpy, numpy
+# ----------------------------------------------------------------------------------------
+
+import re
+
+import numpy as np
+
+
+class RasterRef(object):
+   """Georeference of a raster (lower-left corner, cell size, spatial reference)."""
+
+   def __init__(self, x_min, y_min, cell_width, cell_height, rows, cols, spatial_reference=None):
+      self.x_min = x_min
+      self.y_min = y_min
+      self.cell_width = cell_width
+      self.cell_height = cell_height
+      self.rows = rows
+      self.cols = cols
+      self.spatial_reference = spatial_reference
+
+   @classmethod
+   def from_raster(cls, raster):
+      import arcpy
+      r = arcpy.Raster(raster)
+      return cls(r.extent.XMin, r.extent.YMin, r.meanCellWidth, r.meanCellHeight, r.height, r.width, r.spatialReference)
+
+   def to_dict(self):
+      """JSON-serializable form (the spatial reference as its string representation)."""
+      sr = self.spatial_reference
+      if sr is not None and hasattr(sr, "exportToString"):
+         sr = sr.exportToString()
+      return {"x_min": self.x_min, "y_min": self.y_min, "cell_width": self.cell_width,
+              "cell_height": self.cell_height, "rows": self.rows, "cols": self.cols,
+              "spatial_reference": sr}
+
+   @classmethod
+   def from_dict(cls, d):
+      return cls(d["x_min"], d["y_min"], d["cell_width"], d["cell_height"], d["rows"], d["cols"],
+                 d.get("spatial_reference"))
+
+   def subset(self, window):
+      """Georeference of a (row slice, col slice) window of this grid."""
+      r0, r1 = window[0].indices(self.rows)[:2]
+      c0, c1 = window[1].indices(self.cols)[:2]
+      return RasterRef(self.x_min + c0 * self.cell_width, self.y_min + (self.rows - r1) * self.cell_height,
+                       self.cell_width, self.cell_height, r1 - r0, c1 - c0, self.spatial_reference)
+
+   def meters_per_unit(self):
+      """Meters per linear unit of the spatial reference (1 without one: unit cells in meters).
+      Raises ValueError for geographic coordinates, whose cells have no size in meters."""
+      sr = self.spatial_reference
+      if sr is None:
+         return 1.
+      if hasattr(sr, "metersPerUnit"):
+         # arcpy SpatialReference
+         if sr.type != "Projected":
+            raise ValueError("The raster is in geographic coordinates (%s): project it first" % sr.name)
+         return float(sr.metersPerUnit)
+      # WKT (GDAL) or arcpy spatial reference string: the projection's linear unit is its last UNIT
+      wkt = str(sr).split(";")[0].strip()
+      units = re.findall(r'UNIT\[\s*"[^"]*"\s*,\s*([-+0-9.eE]+)', wkt, re.IGNORECASE)
+      if not wkt.upper().startswith(("PROJCS", "PROJCRS")) or not units:
+         raise ValueError("The raster is not in projected coordinates: project it first")
+      return float(units[-1])
+
+   def offset(self, ref, name="The raster"):
+      """(rows, cols) offset of grid 'ref' within this grid. Rasters are read on another grid
+      without resampling: raises ValueError unless the two grids have the same, aligned cells."""
+      if abs(self.cell_width - ref.cell_width) > self.cell_width * 1e-6 or \
+            abs(self.cell_height - ref.cell_height) > self.cell_height * 1e-6:
+         raise ValueError("%s has another cell size than the grid (%s, %s): resample it to the grid first" %
+                          (name, self.cell_width, ref.cell_width))
+      dc = (ref.x_min - self.x_min) / self.cell_width
+      dr = ((self.y_min + self.rows * self.cell_height) - (ref.y_min + ref.rows * ref.cell_height)) / self.cell_height
+      if abs(dc - round(dc)) > 1e-3 or abs(dr - round(dr)) > 1e-3:
+         raise ValueError("%s has cells not aligned with the grid: resample it to the grid first" % name)
+      return int(round(dr)), int(round(dc))
+
+
+class RasterReader(object):
+   """Read-only 2D array-like view of a raster on the grid of 'ref' (default:
+   the raster's own grid). Slicing reads only that window (RasterToNumPyArray),
+   as float64 with NoData (and cells outside the raster) as NaN. The raster must
+   have the cell size of 'ref' and cells aligned with it (RasterRef.offset)."""
+
+   def __init__(self, raster, ref=None):
+      import arcpy
+      self.raster = arcpy.Raster(raster)
+      own = RasterRef.from_raster(self.raster)
+      if ref is not None:
+         own.offset(ref, str(raster))
+      self.ref = ref or own
+      self.shape = (self.ref.rows, self.ref.cols)
+
+   def __getitem__(self, window):
+      import arcpy
+      rows, cols = window
+      r0, r1 = rows.indices(self.shape[0])[:2]
+      c0, c1 = cols.indices(self.shape[1])[:2]
+      corner = arcpy.Point(self.ref.x_min + c0 * self.ref.cell_width,
+                           self.ref.y_min + (self.shape[0] - r1) * self.ref.cell_height)
+      nd = self.raster.noDataValue
+      if nd is None:
+         arr = arcpy.RasterToNumPyArray(self.raster, corner, c1 - c0, r1 - r0)
+      else:
+         arr = arcpy.RasterToNumPyArray(self.raster, corner, c1 - c0, r1 - r0, nd)
+      arr = arr.astype(np.float64)
+      if nd is not None:
+         arr[arr == nd] = np.nan
+      return arr
+
+
+def read_raster(raster):
+   """Read a raster into a float64 array with NoData as NaN. Returns (array, RasterRef)."""
+   import arcpy
+   r = arcpy.Raster(raster)
+   arr = arcpy.RasterToNumPyArray(r).astype(np.float64)
+   if r.noDataValue is not None:
+      arr[arr == r.noDataValue] = np.nan
+   return arr, RasterRef.from_raster(r)
+
+
+def write_raster(arr, ref, out_raster, nodata=-9999):
+   """Save an array to 'out_raster', aligned to 'ref'. Float arrays use NaN for NoData
+   (written as 'nodata'); integer arrays are written as they are, with 'nodata' as
+   their NoData value. Returns the saved arcpy Raster."""
+   import arcpy
+   arr = np.asarray(arr)
+   if arr.dtype.kind == 'f':
+      arr = np.where(np.isnan(arr), nodata, arr)
+   r = arcpy.NumPyArrayToRaster(arr, arcpy.Point(ref.x_min, ref.y_min), ref.cell_width, ref.cell_height, nodata)
+   r.save(out_raster)
+   if ref.spatial_reference is not None:
+      sr = ref.spatial_reference
+      if not hasattr(sr, "exportToString"):
+         # stored as a string (RasterRef.to_dict)
+         sr = arcpy.SpatialReference()
+         sr.loadFromString(ref.spatial_reference)
+      arcpy.DefineProjection_management(out_raster, sr)
+   return arcpy.Raster(out_raster)
+
+
+def value_range(raster):
+   """(min, max) of a raster from its statistics, or None if it has none."""
+   import arcpy
+   r = arcpy.Raster(raster)
+   if r.minimum is None or r.maximum is None:
+      return None
+   return r.minimum, r.maximum
+
+
+# bits per cell of arcpy pixel types
+PIXEL_BITS = {"U1": 1, "U2": 2, "U4": 4, "U8": 8, "S8": 8, "U16": 16, "S16": 16,
+              "U32": 32, "S32": 32, "F32": 32, "F64": 64}
+
+
+def raster_size(raster):
+   """(cells, bytes) of a raster, bytes being its uncompressed size (for timing spans)."""
+   import arcpy
+   r = arcpy.Raster(raster)
+   cells = r.width * r.height * r.bandCount
+   return cells, cells * PIXEL_BITS.get(r.pixelType, 32) // 8
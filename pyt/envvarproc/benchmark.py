@@ -0,0 +1,253 @@
+# ----------------------------------------------------------------------------------------
+# benchmark.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Benchmarks of the array backends on synthetic data, without arcpy:
+#   reclass   - LUT reclass of a classified raster (NLCD 1992, NLCD 2001, CCAP codes)
+#   landcover - reclass + focal mean + Con(IsNull) + mask (the land cover tools)
+#   fill      - rasterFill (distance-banded, recursive, adaptive, nearest) on a gappy raster
+#   finalize  - finalizeEnvVar (mask, multiply, round, cast)
+# over a grid of raster sizes, neighborhood radii and NoData fractions.
+# Each case runs in a fresh process, so its peak resident memory is its own.
+# Results are written as JSON lines (one record per case), and can be
+# compared with an earlier results file to flag slower or larger cases.
+
+# Usage Tips:
+# From the pyt folder:
+#   python -m envvarproc.benchmark --sizes 512,2048 --radii 10,100 --out bench.jsonl
+#   python -m envvarproc.benchmark --out new.jsonl --compare bench.jsonl
+# Synthetic classified rasters are patchy (blocks of one class, with a share of
+# cells changed at random) and use the class codes and default classes of the
+# tools' schemes (schemes.py). Gappy rasters are smooth surfaces with NoData blobs.
+
+# Dependencies:
+# numpy (scipy optional); 'resource' for memory use (not on Windows)
+# ----------------------------------------------------------------------------------------
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from .instrument import peak_rss_mb
+from .schemes import SCHEMES
+
+# smallest increase flagged by compare, whatever the ratio (timer noise, allocator slack)
+MIN_INCREASE = {"seconds": .05, "peak_rss_mb": 4.}
+
+
+def scheme_lut(scheme):
+   """uint8 LUT of the default classes of registered scheme 'scheme' (as in the tools)."""
+   s = SCHEMES[scheme]
+   return s.lut(s.select())
+
+
+def _blobs(shape, fraction, size, rng):
+   """Boolean array with about 'fraction' of cells True, in blobs of about 'size' cells across."""
+   coarse = (max(1, shape[0] // size + 1), max(1, shape[1] // size + 1))
+   field = rng.rand(*coarse)
+   field = np.repeat(np.repeat(field, size, axis=0), size, axis=1)[:shape[0], :shape[1]]
+   return field < fraction
+
+
+def classified(shape, scheme="NLCD2001", patch=16, noise=.1, nodata=.05, seed=0):
+   """Synthetic classified raster (float64, NoData as NaN): patches of 'patch' cells of one
+   class code, a 'noise' share of cells set to random codes, and a 'nodata' share of NoData."""
+   rng = np.random.RandomState(seed)
+   codes = np.array([c for c in SCHEMES[scheme].codes if c not in SCHEMES[scheme].nodata], dtype=np.float64)
+   coarse = rng.randint(0, len(codes), (shape[0] // patch + 1, shape[1] // patch + 1))
+   idx = np.repeat(np.repeat(coarse, patch, axis=0), patch, axis=1)[:shape[0], :shape[1]]
+   noisy = rng.rand(*shape) < noise
+   idx[noisy] = rng.randint(0, len(codes), int(noisy.sum()))
+   arr = codes[idx]
+   arr[_blobs(shape, nodata, 4 * patch, rng)] = np.nan
+   return arr
+
+
+def gappy(shape, nodata=.2, gap=64, seed=0):
+   """Synthetic continuous raster (a smooth surface) with a 'nodata' share of NoData in blobs of 'gap' cells."""
+   rng = np.random.RandomState(seed)
+   rows, cols = np.mgrid[:shape[0], :shape[1]].astype(np.float64)
+   arr = np.zeros(shape)
+   for k in range(4):
+      f = rng.uniform(.002, .02, 2)
+      arr += rng.uniform(1, 10) * np.sin(rows * f[0] + cols * f[1] + rng.uniform(0, 6.3))
+   arr[_blobs(shape, nodata, gap, rng)] = np.nan
+   return arr
+
+
+def _stage(case):
+   """Inputs and a callable running the stage of 'case'."""
+   from . import fill, finalize, focal, landcover, reclass
+   shape = (case["size"], case["size"])
+   if case["stage"] == "reclass":
+      arr = classified(shape, case["scheme"], nodata=case["nodata"])
+      lut = scheme_lut(case["scheme"])
+      return lambda: reclass.reclass_block(arr, lut)
+   if case["stage"] == "landcover":
+      arr = classified(shape, case["scheme"], nodata=case["nodata"])
+      lut = scheme_lut(case["scheme"])
+      nbrs = [focal.Circle(case["radius"])]
+      out = np.empty((lut.shape[0], 1) + shape, dtype=np.float32)
+      return lambda: landcover.summarize_tiled(arr, lut, nbrs, out, mask=arr, tile_size=case["tile_size"])
+   if case["stage"] == "fill":
+      arr = gappy(shape, case["nodata"])
+      if case.get("typ") == "MAJORITY":
+         # categorical (e.g. soil classes)
+         arr = np.floor(arr)
+      if case["method"] == "NEAREST":
+         return lambda: fill.fill_nearest(arr)
+      if case["method"] == "RECURSIVE":
+         return lambda: fill.fill_recursive(arr, case["typ"], case["radius"])
+      if case["method"] == "ADAPTIVE":
+         return lambda: fill.fill_adaptive(arr, case["typ"])
+      return lambda: fill.fill_banded(arr, case["typ"])
+   if case["stage"] == "finalize":
+      arr = gappy(shape, case["nodata"])
+      mask = np.where(_blobs(shape, .9, 256, np.random.RandomState(1)), 1., np.nan)
+      return lambda: finalize.finalize(arr, 100, mask)
+   raise ValueError("Unknown stage: " + case["stage"])
+
+
+def run_case(case, repeat=1):
+   """Run one case in this process. Returns the case with 'seconds' (best of 'repeat'),
+   'mcells_per_s' and 'peak_rss_mb' (including the inputs) added."""
+   run = _stage(case)
+   best = None
+   for i in range(repeat):
+      t0 = time.time()
+      run()
+      t = time.time() - t0
+      best = t if best is None else min(best, t)
+   result = dict(case)
+   result["seconds"] = round(best, 4)
+   result["mcells_per_s"] = round(case["size"] ** 2 / 1e6 / best, 3) if best > 0 else None
+   result["peak_rss_mb"] = peak_rss_mb()
+   return result
+
+
+def _child(case, repeat, queue):
+   try:
+      queue.put(run_case(case, repeat))
+   except Exception as e:
+      result = dict(case)
+      result["error"] = repr(e)
+      queue.put(result)
+
+
+def run_isolated(case, repeat=1):
+   """run_case in a new process (spawned, so peak memory is the case's own)."""
+   import multiprocessing
+   ctx = multiprocessing.get_context("spawn") if hasattr(multiprocessing, "get_context") else multiprocessing
+   queue = ctx.Queue()
+   p = ctx.Process(target=_child, args=(case, repeat, queue))
+   p.start()
+   result = queue.get()
+   p.join()
+   return result
+
+
+def cases(sizes=(512, 1024, 2048), radii=(10, 30, 100), nodata=(.05, .3), schemes=("NLCD1992", "NLCD2001", "CCAP"),
+          tile_size=1024):
+   """The benchmark grid: every stage over sizes, and each stage's own knobs."""
+   out = []
+   for size in sizes:
+      for scheme in schemes:
+         out.append({"stage": "reclass", "size": size, "scheme": scheme, "nodata": nodata[0]})
+      for radius in radii:
+         for nd in nodata:
+            out.append({"stage": "landcover", "size": size, "scheme": "NLCD2001", "radius": radius,
+                        "nodata": nd, "tile_size": tile_size})
+      for nd in nodata:
+         out.append({"stage": "fill", "size": size, "method": "NEAREST", "nodata": nd})
+         for method in ("BANDED", "RECURSIVE", "ADAPTIVE"):
+            for typ in ("MEAN", "MAJORITY"):
+               out.append({"stage": "fill", "size": size, "method": method, "typ": typ, "radius": 15, "nodata": nd})
+      out.append({"stage": "finalize", "size": size, "nodata": nodata[0]})
+   return out
+
+
+def case_key(case):
+   """Identity of a case (its parameters), for comparing results files."""
+   skip = ("seconds", "mcells_per_s", "peak_rss_mb", "error", "env")
+   return json.dumps(dict((k, v) for k, v in case.items() if k not in skip), sort_keys=True)
+
+
+def compare(results, baseline, threshold=1.25):
+   """Cases slower (or using more memory) than 'threshold' times the baseline, and by
+   more than MIN_INCREASE, as (case key, measure, baseline value, new value) tuples."""
+   base = dict((case_key(r), r) for r in baseline if "error" not in r)
+   worse = []
+   for r in results:
+      b = base.get(case_key(r))
+      if b is None or "error" in r:
+         continue
+      for measure in ("seconds", "peak_rss_mb"):
+         limit = max(threshold * b[measure], b[measure] + MIN_INCREASE[measure]) if b.get(measure) else None
+         if r.get(measure) and limit and r[measure] > limit:
+            worse.append((case_key(r), measure, b[measure], r[measure]))
+   return worse
+
+
+def environment():
+   try:
+      import scipy
+      scipy_version = scipy.__version__
+   except ImportError:
+      scipy_version = None
+   return {"python": platform.python_version(), "numpy": np.__version__, "scipy": scipy_version,
+           "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def _numbers(text, kind=int):
+   return [kind(v) for v in text.split(",") if v]
+
+
+def main(argv=None):
+   parser = argparse.ArgumentParser(description="Benchmark the envvarproc array backends on synthetic rasters.")
+   parser.add_argument("--sizes", default="512,1024,2048", help="raster sizes (cells per side)")
+   parser.add_argument("--radii", default="10,30,100", help="circle neighborhood radii (cells)")
+   parser.add_argument("--nodata", default="0.05,0.3", help="NoData fractions")
+   parser.add_argument("--stages", default="reclass,landcover,fill,finalize", help="stages to run")
+   parser.add_argument("--tile-size", type=int, default=1024)
+   parser.add_argument("--repeat", type=int, default=1, help="runs per case (best time is kept)")
+   parser.add_argument("--out", help="results file (JSON lines)")
+   parser.add_argument("--compare", help="earlier results file to compare with")
+   parser.add_argument("--threshold", type=float, default=1.25, help="ratio flagged as a regression")
+   args = parser.parse_args(argv)
+
+   stages = args.stages.split(",")
+   grid = [c for c in cases(_numbers(args.sizes), _numbers(args.radii), _numbers(args.nodata, float),
+                            tile_size=args.tile_size) if c["stage"] in stages]
+   env = environment()
+   results = []
+   out = open(args.out, "w") if args.out else None
+   for case in grid:
+      r = run_isolated(case, args.repeat)
+      r["env"] = env
+      results.append(r)
+      print(json.dumps(dict((k, v) for k, v in r.items() if k != "env"), sort_keys=True))
+      sys.stdout.flush()
+      if out:
+         out.write(json.dumps(r, sort_keys=True) + "\n")
+         out.flush()
+   if out:
+      out.close()
+
+   if args.compare:
+      with open(args.compare) as f:
+         baseline = [json.loads(line) for line in f if line.strip()]
+      worse = compare(results, baseline, args.threshold)
+      for key, measure, old, new in worse:
+         print("REGRESSION %s %s: %s -> %s" % (key, measure, old, new))
+      return 1 if worse else 0
+   return 0
+
+
+if __name__ == "__main__":
+   sys.exit(main())
@@ -0,0 +1,144 @@
+# ----------------------------------------------------------------------------------------
+# cache.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# On-disk cache for preprocessed inputs (processing extents, clipped masks,
+# cleaned layers) shared between tools and runs. Entries are folders named by
+# a key hashed from fingerprints of the input datasets and the processing
+# parameters, so a run over the same inputs can reuse another run's
+# preprocessing regardless of project name or output workspace. The least
+# recently used entries are removed when the cache grows past a size cap.
+
+# Usage Tips:
+# Input fingerprints use file sizes and modification times (not contents),
+# so an edited input gets a new key. A folder is only used as an entry once
+# its 'build' function has completed; interrupted builds leave no entry.
+
+# Dependencies:
+# none
+# ----------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+# default cache size cap, in bytes
+MAX_BYTES = 20 * 1024 ** 3
+
+# marker written (and touched on use) in complete entries
+MARKER = "entry.json"
+
+
+def _stat_files(path):
+   """(relative path, size, mtime) of the files making up dataset 'path'."""
+   if os.path.isdir(path):
+      out = []
+      for root, dirs, files in os.walk(path):
+         dirs.sort()
+         for f in sorted(files):
+            p = os.path.join(root, f)
+            st = os.stat(p)
+            out.append((os.path.relpath(p, path), st.st_size, int(st.st_mtime)))
+      return out
+   # a file and its sidecars: <stem>.<ext> (e.g. .shp/.dbf/.prj, .tif/.tfw) and <name>.* (.tif.aux.xml);
+   # the stem may hold dots itself (nlcd_2019.v2.tif)
+   folder, name = os.path.split(path)
+   stem = os.path.splitext(name)[0]
+   return [(f, os.path.getsize(os.path.join(folder, f)), int(os.path.getmtime(os.path.join(folder, f))))
+           for f in sorted(os.listdir(folder or "."))
+           if f == name or f.startswith(name + ".") or (f.startswith(stem + ".") and "." not in f[len(stem) + 1:])]
+
+
+def fingerprint(path):
+   """Fingerprint of a dataset path (None -> ''). Datasets inside a geodatabase (or any
+   path that is not itself on disk) are fingerprinted by their nearest existing folder."""
+   if not path:
+      return ""
+   path = os.path.abspath(str(path))
+   base = path
+   while base and not os.path.exists(base):
+      parent = os.path.dirname(base)
+      if parent == base:
+         return path
+      base = parent
+   return json.dumps([path, _stat_files(base)])
+
+
+def cache_key(*parts):
+   """Hex key for an entry built from 'parts' (strings, numbers or None)."""
+   h = hashlib.sha1()
+   for p in parts:
+      h.update(repr(p).encode("utf-8"))
+      h.update(b"\0")
+   return h.hexdigest()
+
+
+def _size(folder):
+   return sum(os.path.getsize(os.path.join(root, f)) for root, dirs, files in os.walk(folder) for f in files)
+
+
+class DiskCache(object):
+   """Folder of cache entries (one sub-folder per key), capped at 'max_bytes'."""
+
+   def __init__(self, root, max_bytes=MAX_BYTES):
+      self.root = root
+      self.max_bytes = max_bytes
+      if not os.path.isdir(root):
+         os.makedirs(root)
+
+   def path(self, key):
+      return os.path.join(self.root, key)
+
+   def get(self, key):
+      """Entry folder for 'key' (marked as just used), or None."""
+      marker = os.path.join(self.path(key), MARKER)
+      if not os.path.exists(marker):
+         return None
+      os.utime(marker, None)
+      return self.path(key)
+
+   def put(self, key, build, info=None):
+      """Create the entry for 'key': build(folder) writes the entry's datasets into a new
+      folder, which becomes the entry when it returns. Returns the entry folder."""
+      tmp = os.path.join(self.root, "tmp_" + uuid.uuid4().hex)
+      os.makedirs(tmp)
+      try:
+         build(tmp)
+         with open(os.path.join(tmp, MARKER), "w") as f:
+            json.dump({"key": key, "created": time.time(), "info": info}, f)
+         if os.path.exists(self.path(key)):
+            # built meanwhile by another run
+            shutil.rmtree(tmp)
+         else:
+            os.rename(tmp, self.path(key))
+      except Exception:
+         shutil.rmtree(tmp, ignore_errors=True)
+         raise
+      self.evict(keep=key)
+      return self.path(key)
+
+   def entries(self):
+      """(last used time, size, key) of complete entries, least recently used first."""
+      out = []
+      for key in os.listdir(self.root):
+         marker = os.path.join(self.path(key), MARKER)
+         if os.path.exists(marker):
+            out.append((os.path.getmtime(marker), _size(self.path(key)), key))
+      return sorted(out)
+
+   def evict(self, keep=None):
+      """Remove least recently used entries (except 'keep') until the cache fits 'max_bytes'."""
+      entries = self.entries()
+      total = sum(size for used, size, key in entries)
+      for used, size, key in entries:
+         if total <= self.max_bytes:
+            break
+         if key == keep:
+            continue
+         shutil.rmtree(self.path(key), ignore_errors=True)
+         total -= size
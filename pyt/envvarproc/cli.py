@@ -0,0 +1,158 @@
+# ----------------------------------------------------------------------------------------
+# cli.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Command line runs of the toolbox's NUMPY backends, without arcpy, on
+# GeoTIFF or .npy rasters (raster_io.py), e.g. on Linux compute nodes:
+#   finalize  - finalizeEnvVar (mask, scale, round and cast)
+#   fill      - rasterFill / rasterFillBatch (fill NoData areas)
+#   nlcd      - reclassNLCD (land cover neighborhood summaries, NLCD 2001 or 1992)
+#   ccap      - reclassCCAP
+#   landcover - reclassLandCover (any registered scheme, or a scheme JSON file)
+# Each command calls the same functions as the tool (finalize.finalize,
+# fill.fill_batch, summarize.summarize_files), so outputs match the tools'
+# NUMPY backend. Nothing imports arcpy; GDAL is imported only for GeoTIFFs.
+
+# Usage Tips:
+# From the folder holding the envvarproc package (pyt/):
+#   python -m envvarproc finalize in.tif out.tif --mult 100 --mask mask.tif
+#   python -m envvarproc fill a.tif b.tif --template template.tif --out-folder filled
+#   python -m envvarproc nlcd nlcd.tif --out-folder out --project proj --impervious imp.tif
+#   python -m envvarproc <command> --help
+# Inputs must already be on one grid (same cell size, aligned cells; extents
+# may differ): there is no resampling, and no clipping to polygons (the land
+# cover extent comes from the data and the mask, as with the tools' NUMPY
+# backend without extent polygons). Land cover runs are not resumable and do
+# not use the cache or incremental updates; use the tools for those.
+
+# Dependencies:
+# numpy (GeoTIFFs: GDAL Python bindings)
+# ----------------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+
+def _message(msg):
+   print(msg)
+
+
+def run_finalize(args):
+   from . import finalize, raster_io
+   # on the mask grid (if a mask is given), in the smallest integer type for the values
+   ref = raster_io.raster_ref(args.mask or args.input)
+   values = raster_io.RasterReader(args.input, ref)
+   mask = raster_io.RasterReader(args.mask, ref) if args.mask else None
+   out, nodata = finalize.finalize(values, args.mult, mask, value_range=raster_io.value_range(args.input))
+   raster_io.write_raster(out, ref, args.output, nodata)
+   _message("Saved " + args.output + ".")
+
+
+def run_fill(args):
+   from . import fill, focal, raster_io
+   # template grid and mask, once for all rasters
+   tref = raster_io.raster_ref(args.template)
+   intempl = focal.valid_mask(raster_io.RasterReader(args.template, tref)[:, :])
+   if not os.path.isdir(args.out_folder):
+      os.makedirs(args.out_folder)
+
+   def layers():
+      for lyr in args.inputs:
+         _message("Filling " + lyr + "...")
+         yield lyr, raster_io.RasterReader(lyr, tref)[:, :]
+
+   def save(lyr, out):
+      out[~intempl] = np.nan
+      name = os.path.splitext(os.path.basename(lyr))[0] + args.suffix + "." + args.format
+      raster_io.write_raster(out, tref, os.path.join(args.out_folder, name))
+      _message("Saved " + name + ".")
+
+   # (no arcpy: files are loaded and saved on threads of their own)
+   fill.fill_batch(layers(), save, args.type, args.radius, args.recursive, target=intempl, workers=args.workers,
+                   adaptive=args.adaptive and not args.recursive, io_threads=True)
+
+
+def run_land_cover(args):
+   from . import schemes, summarize
+   if args.command == "nlcd":
+      scheme = schemes.NLCD1992 if args.nlcd92 else schemes.NLCD2001
+   elif args.command == "ccap":
+      scheme = schemes.CCAP
+   else:
+      scheme = schemes.get_scheme(args.scheme)
+   summarize.summarize_files(scheme, scheme.select(args.classes), args.out_folder, args.project, args.classified,
+                             args.impervious, args.canopy, args.mask, args.tile_size, args.workers,
+                             args.extra_nbrs, args.format, args.quant_mult, args.timing_log, _message)
+
+
+def parser():
+   p = argparse.ArgumentParser(prog="python -m envvarproc",
+                               description="Environmental variables processing (NUMPY backend, no arcpy).")
+   sub = p.add_subparsers(dest="command", metavar="command")
+   sub.required = True
+
+   f = sub.add_parser("finalize", help="finalizeEnvVar: mask, multiply, round and cast to integers")
+   f.add_argument("input", help="raster to finalize")
+   f.add_argument("output", help="output raster (.tif or .npy)")
+   f.add_argument("--mult", type=int, required=True, help="multiplier (e.g. 100)")
+   f.add_argument("--mask", help="mask raster (also sets the output grid)")
+   f.set_defaults(func=run_finalize)
+
+   f = sub.add_parser("fill", help="rasterFill: fill NoData areas of rasters on a template grid")
+   f.add_argument("inputs", nargs="+", help="rasters with NoData gaps, on the template grid")
+   f.add_argument("--template", required=True, help="template raster (grid and mask)")
+   f.add_argument("--out-folder", required=True, help="output folder")
+   f.add_argument("--suffix", default="_fill", help="output file name suffix (default: _fill)")
+   f.add_argument("--format", choices=["tif", "npy"], default="tif", help="output format (default: tif)")
+   f.add_argument("--type", default="MEAN", choices=["MEAN", "MAJORITY", "MEDIAN", "MAXIMUM", "MINIMUM", "NEAREST"],
+                  help="focal statistic (default: MEAN)")
+   f.add_argument("--no-recursive", dest="recursive", action="store_false",
+                  help="one window for all NoData cells instead of the recursive fill")
+   f.add_argument("--radius", type=int, default=15, help="initial recursive fill radius, in cells (default: 15)")
+   f.add_argument("--adaptive", action="store_true",
+                  help="non-recursive fill: size the window per NoData region")
+   f.add_argument("--workers", type=int, default=1, help="rasters filled at a time (default: 1)")
+   f.set_defaults(func=run_fill)
+
+   for name, help_text in (("nlcd", "reclassNLCD: NLCD land cover neighborhood summaries"),
+                           ("ccap", "reclassCCAP: CCAP land cover neighborhood summaries"),
+                           ("landcover", "reclassLandCover: land cover summaries for any scheme")):
+      f = sub.add_parser(name, help=help_text)
+      f.add_argument("classified", help="classified land cover raster")
+      f.add_argument("--out-folder", required=True, help="output folder")
+      f.add_argument("--project", required=True, help="project name (output name prefix)")
+      if name == "nlcd":
+         f.add_argument("--nlcd92", action="store_true", help="NLCD 1992 classes (default: NLCD 2001 and later)")
+      elif name == "landcover":
+         f.add_argument("--scheme", default="NLCD2001",
+                        help="registered scheme (NLCD1992, NLCD2001, CCAP) or scheme JSON file (default: NLCD2001)")
+      f.add_argument("--classes", nargs="+", help="classes to summarize (default: the scheme's default classes)")
+      f.add_argument("--impervious", help="impervious surface raster")
+      f.add_argument("--canopy", help="canopy coverage raster")
+      f.add_argument("--mask", help="mask raster (default: the non-zero classified cells)")
+      f.add_argument("--format", choices=["tif", "npy", "store"], default="tif",
+                     help="outputs: GeoTIFFs, .npy rasters, or an array store <out-folder>/<project> (default: tif)")
+      f.add_argument("--extra-nbrs", nargs="+", default=[],
+                     help="extra neighborhoods, e.g. 50 (circle radius) or 'RECTANGLE 5 5' (cells)")
+      f.add_argument("--tile-size", type=int, default=2048, help="tile size in cells (default: 2048)")
+      f.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+      f.add_argument("--quant-mult", type=int,
+                     help="save integer outputs, finalized with this multiplier (e.g. 100)")
+      f.add_argument("--timing-log", help="timing log file (JSON lines)")
+      f.set_defaults(func=run_land_cover)
+   return p
+
+
+def main(argv=None):
+   args = parser().parse_args(argv)
+   try:
+      args.func(args)
+   except (ImportError, IOError, OSError, ValueError) as e:
+      sys.stderr.write("error: %s\n" % e)
+      return 1
+   return 0
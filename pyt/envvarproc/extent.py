@@ -0,0 +1,93 @@
+# ----------------------------------------------------------------------------------------
+# extent.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Raster-domain version of the land cover tools' processing extent:
+#   RasterDomain -> Buffer 5000 m -> Intersect -> Clip
+# Each valid-data domain is a boolean array on one grid. Buffering is a
+# distance threshold (cells within the buffer distance of a domain cell,
+# from an exact EDT, computed tile by tile with a halo of the buffer
+# distance). The buffered domains are intersected as boolean arrays, and the
+# result is cropped to its bounding window, so clipping an input is a window
+# read (or a view of an array) instead of a new raster.
+
+# Usage Tips:
+# Buffer distances are in cells, measured between cell centers.
+
+# Dependencies:
+# numpy (scipy optional, see fill.edt)
+# ----------------------------------------------------------------------------------------
+
+import json
+import math
+import os
+
+import numpy as np
+
+from .fill import edt
+from .focal import valid_mask
+from .tiles import iter_tiles
+
+
+def domain(arr, nodata=None, zero_is_nodata=False, tile_size=2048):
+   """Boolean valid-data domain of a 2D array-like, read one tile at a time
+   ('zero_is_nodata': SetNull(x, x, "Value = 0") first)."""
+   out = np.empty(np.shape(arr), dtype=bool)
+   for tile in iter_tiles(out.shape, tile_size):
+      win = tile.write_window
+      block = np.asarray(arr[win])
+      out[win] = valid_mask(block, nodata)
+      if zero_is_nodata:
+         out[win] &= block != 0
+   return out
+
+
+def buffer(valid, cells, tile_size=2048):
+   """Cells within 'cells' (cell-center distance) of a True cell of 'valid'."""
+   reach = int(math.ceil(cells))
+   out = np.empty(valid.shape, dtype=bool)
+   for tile in iter_tiles(valid.shape, tile_size, reach):
+      block = valid[tile.read_window]
+      if block.all() or not block.any():
+         out[tile.write_window] = block[tile.inner]
+         continue
+      out[tile.write_window] = (edt(block)[0] <= cells)[tile.inner]
+   return out
+
+
+def bounding_window(mask):
+   """(row slice, col slice) of the smallest window holding all True cells of 'mask', or None."""
+   rows = np.flatnonzero(mask.any(axis=1))
+   if rows.size == 0:
+      return None
+   cols = np.flatnonzero(mask.any(axis=0))
+   return slice(int(rows[0]), int(rows[-1]) + 1), slice(int(cols[0]), int(cols[-1]) + 1)
+
+
+def processing_extent(domains, cells, tile_size=2048):
+   """Intersection of the domains, each buffered by 'cells'. Returns (window, extent), where
+   'extent' is a view of the intersection cropped to its bounding window (None if empty)."""
+   ext = None
+   for d in domains:
+      b = buffer(d, cells, tile_size)
+      ext = b if ext is None else np.logical_and(ext, b, out=ext)
+   window = bounding_window(ext)
+   if window is None:
+      return None, None
+   return window, ext[window]
+
+
+def save(folder, window, ext):
+   """Save a processing extent (e.g. to a cache entry folder)."""
+   np.save(os.path.join(folder, "extent.npy"), ext)
+   with open(os.path.join(folder, "window.json"), "w") as f:
+      json.dump([[window[0].start, window[0].stop], [window[1].start, window[1].stop]], f)
+
+
+def load(folder):
+   """(window, extent) saved by save()."""
+   with open(os.path.join(folder, "window.json")) as f:
+      rows, cols = json.load(f)
+   return (slice(*rows), slice(*cols)), np.load(os.path.join(folder, "extent.npy"))
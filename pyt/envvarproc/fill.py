@@ -0,0 +1,463 @@
+# ----------------------------------------------------------------------------------------
+# fill.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Array versions of rasterFill. edt() is an exact Euclidean distance
+# transform (Felzenszwalb & Huttenlocher, linear time) that also returns, for
+# every cell, the row/column of the nearest cell with data. With it:
+#   fill_nearest - fills NoData cells with the value of the nearest data cell, in one pass
+#   fill_banded  - reproduces rasterFill's non-recursive focal statistic fill: NoData cells get
+#                  the focal statistic (of the original data) over one window, of twice the
+#                  largest distance to data, evaluated at those cells only.
+#   fill_recursive - the arcpy recursive loop itself, done incrementally: each iteration only
+#                  looks at tiles that still have NoData cells, finds the frontier (NoData cells
+#                  within the current radius of filled cells) there, and evaluates the statistic
+#                  at those cells only; the NoData count is kept as a running total.
+#   fill_adaptive  - the non-recursive (single window) fill, with the window radius sized per
+#                  connected NoData region (twice the region's maximum distance to data)
+#                  instead of once for the whole raster.
+#   fill_layer     - rasterFill's NUMPY backend: one of the fills above, as chosen by the
+#                  tool's options.
+#   fill_batch     - fills many layers on one grid, sharing the geometry above (FillCache)
+#                  between layers with the same NoData pattern.
+
+# Usage Tips:
+# Distances and radii are in cells. If scipy is installed, edt() uses
+# scipy.ndimage.distance_transform_edt; otherwise a numpy implementation
+# (about a second for 4 million cells; install scipy for larger grids).
+# Ties between equally near data cells may be broken differently by the two.
+# Statistics other than MEAN are exact either way (see rank.py for large windows).
+# label() likewise uses scipy.ndimage.label if available.
+
+# Dependencies:
+# numpy (scipy optional)
+# ----------------------------------------------------------------------------------------
+
+import hashlib
+import math
+import threading
+import warnings
+
+import numpy as np
+
+from . import pipeline
+from .focal import Circle, Integral, offsets, valid_mask
+from .rank import focal_rank_at
+from .tiles import Tile, iter_tiles
+
+try:
+   from scipy import ndimage
+except ImportError:
+   ndimage = None
+
+# focal statistics supported by fill_banded
+STATISTICS = ('MEAN', 'MAJORITY', 'MEDIAN', 'MAXIMUM', 'MINIMUM')
+
+# window size (cells) from which MAJORITY/MEDIAN/MAXIMUM/MINIMUM use sliding histograms
+HISTOGRAM_WINDOW = 1000
+
+# cells per strip of rows in the numpy distance transform (_edt_numpy)
+EDT_STRIP_CELLS = 2 ** 22
+
+
+def _column_features(valid):
+   """Nearest data row in the same column for every cell, and its distance (inf if none)."""
+   h = valid.shape[0]
+   idx = np.arange(h)[:, None]
+   up = np.maximum.accumulate(np.where(valid, idx, -1), axis=0)
+   down = np.minimum.accumulate(np.where(valid, idx, 2 * h)[::-1], axis=0)[::-1]
+   d_up = np.where(up >= 0, idx - up, np.inf)
+   d_down = np.where(down < h, down - idx, np.inf)
+   nearer_up = d_up <= d_down
+   return np.where(nearer_up, up, down), np.where(nearer_up, d_up, d_down)
+
+
+def _envelope(f):
+   """Squared distance along each row to the nearest parabola (c - q)**2 + f[r, q], and its
+   column q: the lower envelope of each row's parabolas is built one column at a time
+   (all rows together), then looked up for every cell at once."""
+   h, w = f.shape
+   rows = np.arange(h)
+   fv = (f + np.arange(w) ** 2).ravel()     # parabola heights at column 0, flat: fv[r * w + q]
+   v = np.zeros(h * w, dtype=np.intp)       # columns of parabolas in each row's envelope, flat
+   z = np.full((h, w + 1), np.inf)          # left boundaries of the envelope parabolas
+   zf = z.ravel()
+   k = np.full(h, -1, dtype=np.intp)        # index of the last parabola (-1: empty)
+   for q in range(w):
+      act = rows[np.isfinite(f[:, q])]
+      if not len(act):
+         continue
+      fq = fv[act * w + q]
+      # pop the parabolas hidden by parabola q (only rows that popped are checked again)
+      r, i = act[k[act] >= 0], np.nonzero(k[act] >= 0)[0]
+      while len(r):
+         kk = k[r]
+         vk = v[r * w + kk]
+         pop = (fq[i] - fv[r * w + vk]) / (2.0 * (q - vk)) <= zf[r * (w + 1) + kk]
+         r, i = r[pop], i[pop]
+         k[r] -= 1
+         keep = k[r] >= 0
+         r, i = r[keep], i[keep]
+      kk = k[act]
+      vk = v[act * w + np.maximum(kk, 0)]
+      s = np.where(kk >= 0, (fq - fv[act * w + vk]) / (2.0 * np.maximum(q - vk, 1)), -np.inf)
+      k[act] = kk + 1
+      v[act * w + kk + 1] = q
+      zf[act * (w + 1) + kk + 1] = s
+   v = v.reshape(h, w)
+   # parabola of cell (r, c): number of boundaries z[r, 1:k + 1] left of c, found for all cells
+   # by one search of the boundaries clipped to [-1, w] and offset by w + 2 per row; boundaries
+   # are fractions with denominators below 2 * w, so the offsets do not change the order
+   z = np.clip(z[:, 1:], -1, w)
+   z[np.arange(w)[None, :] >= k[:, None]] = w
+   z += (rows * (w + 2.))[:, None]
+   cells = np.arange(w) + (rows * (w + 2.))[:, None]
+   j = np.searchsorted(z.ravel(), cells.ravel()).reshape(h, w) - rows[:, None] * w
+   del z, cells
+   col = v[rows[:, None], j]
+   return (np.arange(w) - col) ** 2 + f[rows[:, None], col], col
+
+
+def _edt_numpy(valid, strip_cells=EDT_STRIP_CELLS):
+   """Exact EDT with feature indices: column pass (all columns together), then the lower
+   envelope of parabolas along each row, in strips of rows of about 'strip_cells' cells so
+   temporary arrays stay small. Takes about a second on a 2000 x 2000 grid, and the row
+   pass loops over columns in Python: larger grids call for scipy."""
+   h, w = valid.shape
+   strip = max(1, strip_cells // w)
+   feat_row, g = _column_features(valid)
+   dist = np.empty((h, w))
+   feat_col = np.empty((h, w), dtype=np.intp)
+   for a in range(0, h, strip):
+      dist[a:a + strip], feat_col[a:a + strip] = _envelope(g[a:a + strip] ** 2)
+   np.sqrt(dist, out=dist)
+   feat_row = feat_row[np.arange(h)[:, None], feat_col]
+   has = np.isfinite(dist)
+   return dist, (np.where(has, feat_row, 0), np.where(has, feat_col, 0))
+
+
+def edt(valid):
+   """Exact Euclidean distance (in cells) from every cell to the nearest True cell of
+   'valid', and the (rows, cols) index arrays of that cell. Distance is inf (and the
+   indices meaningless) if 'valid' has no True cells."""
+   valid = np.asarray(valid, dtype=bool)
+   if not valid.any():
+      return np.full(valid.shape, np.inf), (np.zeros(valid.shape, np.intp), np.zeros(valid.shape, np.intp))
+   if ndimage is not None:
+      dist, idx = ndimage.distance_transform_edt(~valid, return_indices=True)
+      return dist, (idx[0], idx[1])
+   return _edt_numpy(valid)
+
+
+def fill_nearest(arr, target=None, nodata=None, cache=None):
+   """Fill NoData cells with the value of the nearest data cell. Only cells in
+   'target' (default: all) are filled; returns a float64 copy."""
+   out = np.array(arr, dtype=np.float64)
+   valid = valid_mask(arr, nodata)
+   out[~valid] = np.nan
+   todo = ~valid if target is None else (~valid & target)
+   if not valid.any() or not todo.any():
+      return out
+   dist, (fr, fc) = _edt_cached(valid, cache)
+   out[todo] = out[fr[todo], fc[todo]]
+   return out
+
+
+def _majority(v):
+   """Most frequent value in each row of 'v' (NaN ignored; ties -> lowest value)."""
+   s = np.sort(v, axis=1)
+   n = s.shape[1]
+   pos = np.arange(n)
+   start = np.ones(s.shape, dtype=bool)
+   start[:, 1:] = s[:, 1:] != s[:, :-1]
+   run = pos - np.maximum.accumulate(np.where(start, pos, 0), axis=1)
+   run[np.isnan(s)] = -1
+   return s[np.arange(len(s)), np.argmax(run, axis=1)]
+
+
+def _stat_at(arr, valid, rows, cols, nbr, typ):
+   """Focal statistic 'typ' at cells (rows, cols), gathering each window's values."""
+   h, w = arr.shape
+   offs = np.array(offsets(nbr))
+   out = np.empty(len(rows))
+   step = max(1, 2 ** 22 // len(offs))
+   for a in range(0, len(rows), step):
+      r = rows[a:a + step, None] + offs[:, 0]
+      c = cols[a:a + step, None] + offs[:, 1]
+      inside = (r >= 0) & (r < h) & (c >= 0) & (c < w)
+      r = np.clip(r, 0, h - 1)
+      c = np.clip(c, 0, w - 1)
+      vals = np.where(inside & valid[r, c], arr[r, c], np.nan)
+      with warnings.catch_warnings():
+         warnings.simplefilter("ignore", RuntimeWarning)
+         if typ == 'MEDIAN':
+            out[a:a + step] = np.nanmedian(vals, axis=1)
+         elif typ == 'MAXIMUM':
+            out[a:a + step] = np.nanmax(vals, axis=1)
+         elif typ == 'MINIMUM':
+            out[a:a + step] = np.nanmin(vals, axis=1)
+         else:
+            out[a:a + step] = _majority(vals)
+   return out
+
+
+def focal_stat_at(arr, rows, cols, nbr, typ='MEAN', nodata=None, integral=None):
+   """Focal statistic 'typ' (see STATISTICS) of 'arr' over 'nbr', evaluated only at
+   cells (rows, cols). 'integral' may be a precomputed focal.Integral of arr (MEAN).
+   Other statistics over large circles use sliding histograms (rank.focal_rank_at),
+   small windows gather each window's values."""
+   if typ not in STATISTICS:
+      raise ValueError("Unsupported focal statistic: " + str(typ))
+   if typ == 'MEAN':
+      integral = integral or Integral(arr, nodata)
+      return integral.mean_at(rows, cols, nbr)
+   arr = np.asarray(arr, dtype=np.float64)
+   valid = valid_mask(arr, nodata)
+   if isinstance(nbr, Circle) and nbr.cells >= HISTOGRAM_WINDOW:
+      try:
+         return focal_rank_at(arr, valid, rows, cols, nbr, typ)
+      except ValueError:
+         # MAJORITY of (near-)continuous values: too many histogram bins
+         pass
+   return _stat_at(arr, valid, rows, cols, nbr, typ)
+
+
+def fill_banded(arr, typ='MEAN', target=None, nodata=None, cache=None):
+   """Fill NoData cells with focal statistic 'typ' of the original data, using the
+   single window rasterFill uses without recursion: a radius of twice the largest
+   distance to data. Only cells in 'target' (default: all) are filled; returns a
+   float64 copy."""
+   arr = np.asarray(arr)
+   out = np.array(arr, dtype=np.float64)
+   valid = valid_mask(arr, nodata)
+   out[~valid] = np.nan
+   if not valid.any():
+      return out
+   dist, idx = _edt_cached(valid, cache)
+   if target is not None:
+      dist = np.where(target | valid, dist, 0)
+   # statistics always come from the original data (r2_orig in rasterFill)
+   orig = out.copy()
+   integral = Integral(orig) if typ == 'MEAN' else None
+   todo = (dist > 0) & np.isfinite(dist)
+   if todo.any():
+      rows, cols = np.nonzero(todo)
+      out[rows, cols] = focal_stat_at(orig, rows, cols, Circle(2 * dist[todo].max()), typ, integral=integral)
+   return out
+
+
+def _label_numpy(mask):
+   """label() without scipy: row runs of True cells, joined where they overlap between
+   adjacent rows (union-find with pointer jumping, vectorized over all runs)."""
+   h, w = mask.shape
+   edges = np.diff(np.pad(mask.astype(np.int8), ((0, 0), (1, 1)), "constant"), axis=1)
+   run_row, run_c0 = np.nonzero(edges == 1)
+   run_c1 = np.nonzero(edges == -1)[1]
+   n = len(run_row)
+   labels = np.zeros(mask.shape, dtype=np.int32)
+   if n == 0:
+      return labels, 0
+   # runs of the next row overlapping each run (4-connectivity: shared columns)
+   key0 = run_row * (w + 1) + run_c0
+   key1 = run_row * (w + 1) + run_c1
+   lo = np.searchsorted(key1, (run_row + 1) * (w + 1) + run_c0, "right")
+   hi = np.searchsorted(key0, (run_row + 1) * (w + 1) + run_c1, "left")
+   count = np.maximum(hi - lo, 0)
+   a = np.repeat(np.arange(n), count)
+   b = np.repeat(lo, count) + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+   parent = np.arange(n)
+   while True:
+      ra, rb = parent[a], parent[b]
+      join = ra != rb
+      if not join.any():
+         break
+      np.minimum.at(parent, np.maximum(ra[join], rb[join]), np.minimum(ra[join], rb[join]))
+      while True:
+         up = parent[parent]
+         if np.array_equal(up, parent):
+            break
+         parent = up
+   roots, ids = np.unique(parent, return_inverse=True)
+   length = run_c1 - run_c0
+   rows = np.repeat(run_row, length)
+   cols = np.repeat(run_c0, length) + np.arange(length.sum()) - np.repeat(np.cumsum(length) - length, length)
+   labels[rows, cols] = np.repeat(ids + 1, length)
+   return labels, len(roots)
+
+
+def label(mask):
+   """Connected regions (4-connectivity) of the True cells of 'mask'. Returns (labels, n):
+   an int32 array of region numbers 1..n (0 outside the regions) and the number of regions."""
+   mask = np.asarray(mask, dtype=bool)
+   if ndimage is not None:
+      labels, n = ndimage.label(mask)
+      return labels.astype(np.int32), int(n)
+   return _label_numpy(mask)
+
+
+def component_bands(dist, todo):
+   """Cells of 'todo' grouped by the window radius for their NoData region: twice the
+   region's maximum distance to data, i.e. rasterFill's single-shot radius computed per
+   connected region instead of over the whole raster. Returns a list of (rows, cols,
+   radius), smallest radius first. Regions out of reach of any data are left out."""
+   todo = todo & np.isfinite(dist)
+   labels, n = label(todo)
+   if n == 0:
+      return []
+   rows, cols = np.nonzero(todo)
+   lab = labels[rows, cols]
+   maxd = np.zeros(n + 1)
+   np.maximum.at(maxd, lab, dist[rows, cols])
+   radius = 2 * maxd[lab]
+   order = np.argsort(radius, kind="mergesort")
+   rows, cols, radius = rows[order], cols[order], radius[order]
+   cuts = np.flatnonzero(np.diff(radius)) + 1
+   return [(r, c, rad[0]) for r, c, rad in zip(np.split(rows, cuts), np.split(cols, cuts), np.split(radius, cuts))]
+
+
+def fill_adaptive(arr, typ='MEAN', target=None, nodata=None, cache=None):
+   """Single-shot fill with the window sized per NoData region (see component_bands):
+   a small gap no longer gets the window needed for the largest one. Each region is
+   filled with focal statistic 'typ' of the original data, evaluated at its own cells,
+   so the cost follows the size of the gaps and their windows rather than the largest
+   gap over the whole raster. Only cells in 'target' (default: all) are filled; returns
+   a float64 copy."""
+   arr = np.asarray(arr)
+   out = np.array(arr, dtype=np.float64)
+   valid = valid_mask(arr, nodata)
+   out[~valid] = np.nan
+   if not valid.any():
+      return out
+   todo = ~valid if target is None else (~valid & target)
+   key = ('components', _digest(valid), None if target is None else _digest(target))
+   bands = _cached(cache, key, lambda: component_bands(_edt_cached(valid, cache)[0], todo))
+   orig = out.copy()
+   integral = Integral(orig) if typ == 'MEAN' else None
+   for rows, cols, radius in bands:
+      out[rows, cols] = focal_stat_at(orig, rows, cols, Circle(radius), typ, integral=integral)
+   return out
+
+
+def recursive_frontiers(valid, target=None, rad=15, tile_size=512):
+   """Cells filled by each iteration of the recursive fill, as a list of
+   (rows, cols, focal radius). Iteration n fills the cells still to fill that are
+   within rad * 2**(n-1) cells of data or of cells filled earlier. Only tiles with
+   cells left to fill are visited. Depends only on the NoData pattern, so it can
+   be shared by layers with the same gaps."""
+   shape = valid.shape
+   filled = valid.copy()
+   todo = ~valid if target is None else (~valid & target)
+   tiles = [t for t in iter_tiles(shape, tile_size) if todo[t.write_window].any()]
+   frontiers = []
+   while tiles:
+      halo = int(math.ceil(rad))
+      rows, cols = [], []
+      for t in tiles:
+         t = Tile(t.row0, t.row1, t.col0, t.col1, shape, halo)
+         f = filled[t.read_window]
+         if not f.any():
+            continue
+         dist = edt(f)[0][t.inner]
+         r, c = np.nonzero(todo[t.write_window] & (dist <= rad))
+         rows.append(r + t.row0)
+         cols.append(c + t.col0)
+      rows = np.concatenate(rows) if rows else np.zeros(0, np.intp)
+      cols = np.concatenate(cols) if cols else np.zeros(0, np.intp)
+      if not len(rows):
+         break
+      # the focal window is twice the fill expansion
+      rad = rad * 2
+      frontiers.append((rows, cols, rad))
+      # a frontier cell is within rad/2 of filled cells, which are within rad/2 of
+      # data, so its window always has data and it is always filled
+      filled[rows, cols] = True
+      todo[rows, cols] = False
+      tiles = [t for t in tiles if todo[t.write_window].any()]
+   return frontiers
+
+
+def fill_recursive(arr, typ='MEAN', rad=15, target=None, nodata=None, tile_size=512, progress=None, cache=None):
+   """Recursive fill as in rasterFill's arcpy loop: each iteration fills the NoData cells
+   within 'rad' cells of filled data with focal statistic 'typ' of the original data over a
+   circle of 2 * rad, then doubles rad (see recursive_frontiers). 'progress', if given, is
+   called as progress(rad, remaining) after each iteration. Stops when no cells are left,
+   or none can be reached. Returns a float64 copy."""
+   arr = np.asarray(arr)
+   valid = valid_mask(arr, nodata)
+   orig = np.array(arr, dtype=np.float64)
+   orig[~valid] = np.nan
+   out = orig.copy()
+   remaining = int((~valid if target is None else (~valid & target)).sum())
+   integral = Integral(orig) if typ == 'MEAN' else None
+   key = ('frontiers', _digest(valid), None if target is None else _digest(target), rad, tile_size)
+   frontiers = _cached(cache, key, lambda: recursive_frontiers(valid, target, rad, tile_size))
+   for rows, cols, radius in frontiers:
+      out[rows, cols] = focal_stat_at(orig, rows, cols, Circle(radius), typ, integral=integral)
+      remaining -= len(rows)
+      if progress is not None:
+         progress(radius, remaining)
+   return out
+
+
+def _digest(mask):
+   """Key for a boolean array (shape and packed bits)."""
+   return str(mask.shape) + hashlib.sha1(np.packbits(mask).tobytes()).hexdigest()
+
+
+class FillCache(object):
+   """Fill geometry (EDT and recursive frontiers) keyed by NoData pattern and target,
+   shared by fills of several layers on the same grid; layers with the same gaps
+   reuse it instead of recomputing it. Safe to share between threads."""
+
+   def __init__(self):
+      self._items = {}
+      self._lock = threading.Lock()
+
+   def get(self, key, compute):
+      with self._lock:
+         if key in self._items:
+            return self._items[key]
+      value = compute()
+      with self._lock:
+         return self._items.setdefault(key, value)
+
+
+def _cached(cache, key, compute):
+   return compute() if cache is None else cache.get(key, compute)
+
+
+def _edt_cached(valid, cache):
+   return _cached(cache, ('edt', _digest(valid)), lambda: edt(valid))
+
+
+def fill_layer(arr, typ='MEAN', rad=15, recursive=True, target=None, nodata=None, adaptive=False, cache=None,
+               progress=None):
+   """Fill one layer as rasterFill's options choose: 'NEAREST' (fill_nearest), the recursive
+   fill (fill_recursive, reporting to 'progress'), the window sized per NoData region
+   ('adaptive', fill_adaptive) or the single window (fill_banded)."""
+   if typ == 'NEAREST':
+      return fill_nearest(arr, target, nodata, cache=cache)
+   if recursive:
+      return fill_recursive(arr, typ, rad, target, nodata, progress=progress, cache=cache)
+   if adaptive:
+      return fill_adaptive(arr, typ, target, nodata, cache=cache)
+   return fill_banded(arr, typ, target, nodata, cache=cache)
+
+
+def fill_batch(layers, save, typ='MEAN', rad=15, recursive=True, target=None, nodata=None, workers=1, adaptive=False,
+               io_threads=False):
+   """Fill many layers on the same grid (and with the same 'target'), sharing one FillCache.
+   'layers' is an iterable of (name, array), consumed lazily; save(name, filled) is called
+   for each result, in input order. The fills run on a background thread (pipeline.run)
+   while the next layers are loaded (advancing 'layers') and finished ones saved in this
+   thread, so loading and saving may call arcpy; with workers > 1 the fills run on a thread
+   pool (numpy releases the GIL in the heavy steps, and threads share the cache), with
+   about 'workers' layers loaded ahead. 'io_threads': load and save on threads of their
+   own too (no arcpy). 'adaptive' (non-recursive fills): size the window per NoData
+   region (fill_adaptive)."""
+   cache = FillCache()
+   compute = lambda layer: fill_layer(layer[1], typ, rad, recursive, target, nodata, adaptive, cache)
+   pipeline.run(layers, compute, lambda layer, filled: save(layer[0], filled),
+                workers=workers, depth=max(workers, 1), io_threads=io_threads)
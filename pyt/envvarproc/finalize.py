@@ -0,0 +1,135 @@
+# ----------------------------------------------------------------------------------------
+# finalize.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Array version of finalizeEnvVar: Int(Plus(Times(ExtractByMask(in, mask), mult), .5001))
+# in one streaming pass. Input and mask are read together one block at a time;
+# each block is multiplied, offset and truncated in place, and cast into a
+# preallocated integer output in the smallest integer type that holds the
+# scaled range (plus a NoData value).
+
+# Usage Tips:
+# 'values' and 'mask' can be any 2D array-likes supporting slicing (numpy
+# arrays, memmaps, arcpy_io.RasterReader), aligned to the same grid.
+# Without a 'dtype', the output type comes from 'value_range' (the input's
+# (min, max), e.g. from raster statistics), so the input is read once; without
+# either, a first pass over the blocks finds the value range. Values that do
+# not fit the output type raise a ValueError rather than wrap around.
+# 'mask' may also be a boolean array (True = inside), e.g. to finalize many
+# rasters against one mask read once. finalize_layer finalizes a layer of an
+# array store (store.py), quantized or not.
+
+# Dependencies:
+# numpy
+# ----------------------------------------------------------------------------------------
+
+import numpy as np
+
+from . import lazy
+from .focal import valid_mask
+from .tiles import iter_tiles
+
+# offset added before truncation (as in finalizeEnvVar)
+ROUND_OFFSET = .5001
+
+# candidate output types, smallest first
+INT_TYPES = (np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32, np.int64)
+
+
+def smallest_int_type(lo, hi):
+   """Smallest integer type holding [lo, hi] plus a NoData value. Returns (dtype, nodata);
+   NoData is the type's maximum (unsigned types) or minimum (signed types)."""
+   for t in INT_TYPES:
+      info = np.iinfo(t)
+      if info.min == 0:
+         if lo >= 0 and hi < info.max:
+            return np.dtype(t), int(info.max)
+      elif lo > info.min and hi <= info.max:
+         return np.dtype(t), int(info.min)
+   raise ValueError("Scaled values out of 64-bit integer range")
+
+
+def scaled_type(lo, hi, mult):
+   """smallest_int_type for the finalized values of inputs within [lo, hi]."""
+   a, b = np.trunc(lo * mult + ROUND_OFFSET), np.trunc(hi * mult + ROUND_OFFSET)
+   return smallest_int_type(min(a, b), max(a, b))
+
+
+def _scale(block, valid, mult):
+   """Multiply, offset and truncate 'block' (float64) in place; NoData cells become 0."""
+   block[~valid] = 0
+   np.multiply(block, mult, out=block)
+   np.add(block, ROUND_OFFSET, out=block)
+   np.trunc(block, out=block)
+   return block
+
+
+def _blocks(values, mask, tile_size, nodata):
+   """Yield (window, float64 block, valid) over 'values', masked by 'mask'."""
+   for tile in iter_tiles(np.shape(values), tile_size):
+      win = tile.write_window
+      block = np.array(values[win], dtype=np.float64)
+      valid = valid_mask(block, nodata)
+      if mask is not None:
+         m = np.asarray(mask[win])
+         valid &= m if m.dtype == bool else valid_mask(m)
+      yield win, block, valid
+
+
+def quantize(block, mult, dtype, nodata_out):
+   """Finalized values of a float block (NaN = NoData) as a new array of integer 'dtype'."""
+   valid = ~np.isnan(block)
+   out = _scale(np.array(block, dtype=np.float64), valid, mult).astype(dtype)
+   out[~valid] = nodata_out
+   return out
+
+
+def scaled_range(values, mult, mask=None, tile_size=2048, nodata=None):
+   """(min, max) of the finalized values, or None if there are no data cells."""
+   lo, hi = None, None
+   for win, block, valid in _blocks(values, mask, tile_size, nodata):
+      if valid.any():
+         s = _scale(block, valid, mult)[valid]
+         lo = s.min() if lo is None else min(lo, s.min())
+         hi = s.max() if hi is None else max(hi, s.max())
+   return None if lo is None else (lo, hi)
+
+
+def finalize(values, mult, mask=None, out=None, dtype=None, nodata_out=None, tile_size=2048, nodata=None,
+             value_range=None):
+   """Finalize 'values' block by block. Returns (out, nodata_out): an integer array (the
+   given 'out', or a new one of 'dtype', by default the smallest type for the scaled range,
+   that of 'value_range' if given) and the value used for NoData in it."""
+   if out is None:
+      if dtype is None and value_range is not None:
+         dtype, nodata_out = scaled_type(value_range[0], value_range[1], mult)
+      elif dtype is None:
+         rng = scaled_range(values, mult, mask, tile_size, nodata) or (0, 0)
+         dtype, nodata_out = smallest_int_type(rng[0], rng[1])
+      out = np.empty(np.shape(values), dtype=dtype)
+   info = np.iinfo(out.dtype)
+   if nodata_out is None:
+      nodata_out = int(info.max) if info.min == 0 else int(info.min)
+   for win, block, valid in _blocks(values, mask, tile_size, nodata):
+      dest = out[win]
+      block = _scale(block, valid, mult)
+      s = block[valid]
+      if s.size and (s.min() < info.min or s.max() > info.max or (s == nodata_out).any()):
+         raise ValueError("Scaled values out of the %s output range (outdated raster statistics?)" % out.dtype)
+      np.copyto(dest, block, casting="unsafe")
+      dest[~valid] = nodata_out
+   return out, nodata_out
+
+
+def finalize_layer(layers, name, mult, mask=None, tile_size=2048):
+   """finalize layer 'name' of a store.RasterStore. Returns (out, nodata_out); a quantized
+   layer (with a scale) is finalized from its scaled values, or returned as it is if it was
+   quantized with this multiplier and there is no 'mask'."""
+   values, scale, nodata = layers[name], layers.scale(name), layers.nodata(name)
+   if scale is not None and abs(scale * mult - 1) < 1e-9 and mask is None:
+      return values, nodata
+   if scale is not None:
+      values, nodata = lazy.source(values, nodata) * scale, None
+   return finalize(values, mult, mask, tile_size=tile_size, nodata=nodata)
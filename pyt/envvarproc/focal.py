@@ -0,0 +1,320 @@
+# ----------------------------------------------------------------------------------------
+# focal.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Focal MEAN (equivalent to FocalStatistics(..., "MEAN", "DATA")) for
+# rectangle and circle neighborhoods, using summed-area tables (integral images).
+# A rectangle costs 4 table lookups per cell. A circle is split into row spans;
+# consecutive rows with the same half-width are merged into one rectangle, so
+# the cost per cell depends on the number of distinct spans, not on the
+# number of cells in the window. Several neighborhoods can be read from the same
+# tables (Pyramid / focal_means), so extra neighborhood sizes cost no extra pass.
+# Window sums are exact, so they do not depend on where the table starts (a
+# tiled run equals an untiled one): integer arrays are summed as integers, and
+# float arrays in fixed point, as int64 multiples of a power of two set by the
+# largest absolute value of the layer (a precision of 2**-FIXED_BITS, about
+# 4e-12, of that value). Tiles of a layer must be given the whole layer's
+# largest value ('big') to share its scale.
+
+# NoData handling:
+# NoData cells (NaN, or equal to 'nodata') are ignored, and the mean is the sum
+# of valid cells divided by the count of valid cells in the window (the "DATA"
+# option). Windows with no valid cells are NaN. Cells outside the array are
+# treated as NoData.
+
+# Dependencies:
+# numpy
+# ----------------------------------------------------------------------------------------
+
+import math
+import numpy as np
+
+# summed-area table type for counts and unsigned integer layers (exact window sums up to 2**32 - 1)
+SUM_DTYPE = np.uint32
+
+# float arrays are summed as int64 multiples of the power of two that puts the layer's largest
+# absolute value below 2**FIXED_BITS ...
+FIXED_BITS = 38
+# ... in windows of up to this many cells (a circle of radius 2300; larger ones are summed in float64)
+FIXED_CELLS = 2 ** (62 - FIXED_BITS)
+
+
+class Rectangle(object):
+   """Rectangle neighborhood, in cells (NbrRectangle(width, height, "CELL")).
+   For even sizes, the extra row/column is above/left of the focal cell."""
+
+   def __init__(self, width, height):
+      self.width = int(width)
+      self.height = int(height)
+
+   @property
+   def reach(self):
+      """Maximum offset (in cells) from the focal cell."""
+      return max(self.width // 2, self.height // 2)
+
+   @property
+   def cells(self):
+      """Number of cells in the window."""
+      return self.width * self.height
+
+   def contains(self, dy, dx):
+      """True if the cell at offset (dy, dx) is in the window."""
+      r0 = -(self.height // 2)
+      c0 = -(self.width // 2)
+      return r0 <= dy < r0 + self.height and c0 <= dx < c0 + self.width
+
+   def spans(self):
+      """List of (row0, row1, col0, col1) offset rectangles (inclusive) covering the window."""
+      r0 = -(self.height // 2)
+      c0 = -(self.width // 2)
+      return [(r0, r0 + self.height - 1, c0, c0 + self.width - 1)]
+
+   def __repr__(self):
+      return "Rectangle(%d, %d)" % (self.width, self.height)
+
+
+class Circle(object):
+   """Circle neighborhood, in cells (NbrCircle(radius, "CELL")). A cell is
+   in the window if its center is within 'radius' cells of the focal cell center."""
+
+   def __init__(self, radius):
+      self.radius = float(radius)
+
+   @property
+   def reach(self):
+      """Maximum offset (in cells) from the focal cell."""
+      return int(math.floor(self.radius))
+
+   @property
+   def cells(self):
+      """Number of cells in the window."""
+      if not hasattr(self, "_cells"):
+         self._cells = sum((r1 - r0 + 1) * (c1 - c0 + 1) for r0, r1, c0, c1 in self.spans())
+      return self._cells
+
+   def contains(self, dy, dx):
+      """True if the cell at offset (dy, dx) is in the window."""
+      return dy * dy + dx * dx <= self.radius * self.radius
+
+   def halfwidth(self, dy):
+      """Number of cells either side of the center column included at row offset dy."""
+      r2 = self.radius * self.radius
+      hw = int(math.floor(math.sqrt(max(r2 - dy * dy, 0))))
+      # guard against sqrt rounding at exact squares
+      while (hw + 1) ** 2 + dy * dy <= r2:
+         hw += 1
+      while hw > 0 and hw * hw + dy * dy > r2:
+         hw -= 1
+      return hw
+
+   def spans(self):
+      """List of (row0, row1, col0, col1) offset rectangles (inclusive) covering the window."""
+      r = self.reach
+      # group rows in the top half (dy >= 0) with equal half-width
+      groups = []
+      for dy in range(r + 1):
+         hw = self.halfwidth(dy)
+         if groups and groups[-1][2] == hw:
+            groups[-1][1] = dy
+         else:
+            groups.append([dy, dy, hw])
+      spans = []
+      for a, b, hw in groups:
+         if a == 0:
+            spans.append((-b, b, -hw, hw))
+         else:
+            spans.append((a, b, -hw, hw))
+            spans.append((-b, -a, -hw, hw))
+      return spans
+
+   def __repr__(self):
+      return "Circle(%g)" % self.radius
+
+
+def valid_mask(arr, nodata=None):
+   """Boolean array, True where arr has data (not NaN and not equal to nodata)."""
+   arr = np.asarray(arr)
+   if arr.dtype.kind == 'f':
+      valid = ~np.isnan(arr)
+   else:
+      valid = np.ones(arr.shape, dtype=bool)
+   if nodata is not None:
+      valid &= (arr != nodata)
+   return valid
+
+
+def _integral(a, pad):
+   """Summed-area table of 'a' zero-padded by 'pad' cells on every side,
+   with an extra leading row and column of zeros. Unsigned integer (and boolean)
+   arrays get a uint32 table, and signed integer arrays an int64 table: it may wrap
+   around, but window sums taken from it (in the table's integer arithmetic) are exact
+   as long as the window sum itself fits."""
+   h, w = a.shape
+   dtype = {"u": SUM_DTYPE, "b": SUM_DTYPE, "i": np.int64}.get(a.dtype.kind, np.float64)
+   s = np.zeros((h + 2 * pad + 1, w + 2 * pad + 1), dtype=dtype)
+   s[pad + 1:pad + 1 + h, pad + 1:pad + 1 + w] = a
+   np.cumsum(s, axis=0, out=s)
+   np.cumsum(s, axis=1, out=s)
+   return s
+
+
+def _window_sum(sat, shape, pad, spans):
+   """Sum over the window defined by 'spans' for every cell, from a padded summed-area table."""
+   h, w = shape
+   out = np.zeros(shape, dtype=sat.dtype)
+   for r0, r1, c0, c1 in spans:
+      top, bottom = pad + r0, pad + r1 + 1
+      left, right = pad + c0, pad + c1 + 1
+      out += sat[bottom:bottom + h, right:right + w]
+      out -= sat[top:top + h, right:right + w]
+      out -= sat[bottom:bottom + h, left:left + w]
+      out += sat[top:top + h, left:left + w]
+   return out
+
+
+def _divide(total, count, exp=0):
+   """total * 2**-exp / count, NaN where count is 0."""
+   out = np.full(total.shape, np.nan)
+   has = count > 0
+   out[has] = total[has] / count[has] if exp == 0 else np.ldexp(total[has] / count[has], -exp)
+   return out
+
+
+def summable(arr, nbrs, big=None):
+   """Values of 'arr' (NoData already 0) to build a summed-area table from, and the exponent
+   of its sums (they are multiples of 2**-exp). Float arrays become int64 multiples of 2**-exp,
+   'exp' putting 'big' (the largest absolute value of the layer; default: of 'arr') below
+   2**FIXED_BITS; other arrays, and float arrays with infinite values or windows over
+   FIXED_CELLS cells, are summed as they are (exponent 0)."""
+   arr = np.asarray(arr)
+   if arr.dtype.kind != "f":
+      return arr, 0
+   local = float(np.abs(arr).max()) if arr.size else 0.
+   if big is None:
+      big = local
+   elif local > big:
+      raise ValueError("Values up to %g exceed the largest value of the layer (%g)" % (local, big))
+   if not np.isfinite(big) or max(nbr.cells for nbr in nbrs) > FIXED_CELLS:
+      return arr, 0
+   exp = FIXED_BITS - math.frexp(big)[1]
+   return np.rint(np.ldexp(arr, exp)).astype(np.int64), exp
+
+
+class Pyramid(object):
+   """Focal means over several neighborhoods (e.g. 3x3, 10, 30, 100 and 300 cells)
+   for arrays sharing one NoData pattern ('valid'). The valid-cell counts of each
+   neighborhood are computed once; each array then needs a single summed-area
+   table, from which all neighborhoods are read."""
+
+   def __init__(self, valid, nbrs):
+      self.valid = np.asarray(valid, dtype=bool)
+      self.nbrs = list(nbrs)
+      self.pad = max(nbr.reach for nbr in self.nbrs)
+      sat = _integral(self.valid, self.pad)
+      self.counts = [_window_sum(sat, self.valid.shape, self.pad, nbr.spans()) for nbr in self.nbrs]
+
+   def means(self, arr, big=None):
+      """List of focal means of 'arr' (NoData where not self.valid), one per neighborhood.
+      'big': largest absolute value of the layer 'arr' is a block of (see summable)."""
+      values, exp = summable(np.where(self.valid, arr, 0), self.nbrs, big)
+      sat = _integral(values, self.pad)
+      return [_divide(_window_sum(sat, self.valid.shape, self.pad, nbr.spans()), count, exp)
+              for nbr, count in zip(self.nbrs, self.counts)]
+
+
+def focal_means(arr, nbrs, nodata=None, big=None):
+   """Focal means of a 2D array for each neighborhood in 'nbrs', from one summed-area table."""
+   arr = np.asarray(arr)
+   return Pyramid(valid_mask(arr, nodata), nbrs).means(arr, big)
+
+
+def focal_mean(arr, nbr, nodata=None, big=None):
+   """Focal mean of a 2D array over neighborhood 'nbr' (Rectangle or Circle),
+   ignoring NoData ("DATA" option). Returns a float64 array, NaN where the
+   window has no valid cells. For a block of a larger layer, 'big' is the layer's
+   largest absolute value, so blocks are summed at the same scale (see summable)."""
+   return focal_means(arr, [nbr], nodata, big)[0]
+
+
+def parse_neighborhood(text):
+   """Neighborhood from text: 'CIRCLE r', 'RECTANGLE w h', or a number (circle radius), in cells."""
+   parts = str(text).replace(",", " ").split()
+   if len(parts) == 1:
+      return Circle(float(parts[0]))
+   if parts[0].upper() == "CIRCLE" and len(parts) == 2:
+      return Circle(float(parts[1]))
+   if parts[0].upper() == "RECTANGLE" and len(parts) == 3:
+      return Rectangle(int(parts[1]), int(parts[2]))
+   raise ValueError("Unrecognized neighborhood: " + str(text))
+
+
+def neighborhood_suffix(nbr):
+   """Output name suffix for a neighborhood ('30' for a 30-cell circle, '5x5' for a rectangle)."""
+   if isinstance(nbr, Circle):
+      return "%g" % nbr.radius
+   return "%dx%d" % (nbr.width, nbr.height)
+
+
+def _window_sum_at(sat, shape, rows, cols, spans):
+   """Window sums at cells (rows, cols) from an unpadded summed-area table; window
+   parts outside the array are clipped (treated as zero)."""
+   h, w = shape
+   out = np.zeros(len(rows), dtype=sat.dtype)
+   for r0, r1, c0, c1 in spans:
+      top = np.clip(rows + r0, 0, h)
+      bottom = np.clip(rows + r1 + 1, 0, h)
+      left = np.clip(cols + c0, 0, w)
+      right = np.clip(cols + c1 + 1, 0, w)
+      out += sat[bottom, right] - sat[top, right] - sat[bottom, left] + sat[top, left]
+   return out
+
+
+class Integral(object):
+   """Summed-area tables of the values and valid-cell counts of an array, for
+   evaluating focal means at selected cells only (e.g. NoData cells to fill)."""
+
+   def __init__(self, arr, nodata=None):
+      arr = np.asarray(arr)
+      valid = valid_mask(arr, nodata)
+      self.shape = arr.shape
+      self.sums = _integral(np.where(valid, arr, 0), 0)
+      self.counts = _integral(valid, 0)
+
+   def mean_at(self, rows, cols, nbr):
+      """Focal mean over 'nbr' at cells (rows, cols); NaN where the window has no data."""
+      spans = nbr.spans()
+      total = _window_sum_at(self.sums, self.shape, rows, cols, spans)
+      count = _window_sum_at(self.counts, self.shape, rows, cols, spans)
+      out = np.full(len(rows), np.nan)
+      has = count > 0
+      out[has] = total[has] / count[has]
+      return out
+
+
+def offsets(nbr):
+   """List of (dy, dx) cell offsets in the neighborhood."""
+   r = nbr.reach
+   return [(dy, dx) for dy in range(-r, r + 1) for dx in range(-r, r + 1) if nbr.contains(dy, dx)]
+
+
+def focal_mean_reference(arr, nbr, nodata=None):
+   """Brute-force focal mean (one shifted add per neighborhood cell), for checking focal_mean."""
+   arr = np.asarray(arr)
+   valid = valid_mask(arr, nodata)
+   h, w = arr.shape
+   pad = nbr.reach
+   vals = np.zeros((h + 2 * pad, w + 2 * pad))
+   cnts = np.zeros((h + 2 * pad, w + 2 * pad))
+   vals[pad:pad + h, pad:pad + w] = np.where(valid, arr, 0)
+   cnts[pad:pad + h, pad:pad + w] = valid
+   total = np.zeros((h, w))
+   count = np.zeros((h, w))
+   for dy, dx in offsets(nbr):
+      total += vals[pad + dy:pad + dy + h, pad + dx:pad + dx + w]
+      count += cnts[pad + dy:pad + dy + h, pad + dx:pad + dx + w]
+   out = np.full((h, w), np.nan)
+   has = count > 0
+   out[has] = total[has] / count[has]
+   return out
@@ -0,0 +1,208 @@
+# ----------------------------------------------------------------------------------------
+# incremental.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Incremental update of the land cover neighborhood summaries (landcover.py)
+# for a new release of the land cover data. changed_cells compares the
+# summarized layers of the previous and the new inputs (class layers after
+# the LUT reclass, so a code change between two classes with the same
+# weights is no change; impervious/canopy values; NoData patterns) and
+# returns the changed cells. update_tiled then recomputes, for each
+# neighborhood, only the cells whose window holds a changed cell (the changed
+# cells dilated by the neighborhood), in the tiles within reach of a change,
+# and writes them into the existing summaries array. All other cells keep
+# their previous values, so the focal work scales with the amount of change
+# rather than with the study area.
+
+# Usage Tips:
+# The summaries array 'out' must come from a run on the same grid, layers,
+# neighborhoods, mask and multiplier; the results then equal a full
+# summarize_tiled run on the new inputs. A changed mask is not detected:
+# run a full summary if the mask or processing extent changed.
+
+# Dependencies:
+# numpy
+# ----------------------------------------------------------------------------------------
+
+import numpy as np
+
+from .fill import edt
+from .focal import Circle, _divide, _integral, _window_sum, _window_sum_at, summable, valid_mask
+from .landcover import _output, compact, layer_limits, layer_valid, summarize_block
+from .reclass import reclass_block
+from .tiles import Tile, iter_tiles
+
+# affected cells, as a share of the window read to compute their means, below which the
+# means are evaluated at those cells only (a window sum at one cell costs about 30 times
+# its share of a window sum over a whole array)
+POINT_FRACTION = .03
+
+
+def _differ(a, b):
+   """Cells where two versions of a layer differ (NaN equals NaN)."""
+   a = np.asarray(a)
+   b = np.asarray(b)
+   diff = a != b
+   if a.dtype.kind == "f" or b.dtype.kind == "f":
+      diff &= ~(np.isnan(a) & np.isnan(b))
+   return diff
+
+
+def changed_cells(old, new, lut, old_extras=(), new_extras=(), nodata=None, tile_size=2048):
+   """Cells (rows, cols) where any summarized layer differs between the previous
+   ('old', 'old_extras') and the new inputs ('new', 'new_extras'), read one tile at a time."""
+   rows, cols = [np.zeros(0, dtype=np.intp)], [np.zeros(0, dtype=np.intp)]
+   for tile in iter_tiles(np.shape(new), tile_size):
+      win = tile.write_window
+      changed = _differ(reclass_block(old[win], lut, nodata), reclass_block(new[win], lut, nodata)).any(axis=0)
+      for a, b in zip(old_extras, new_extras):
+         changed |= _differ(a[win], b[win])
+      r, c = np.nonzero(changed)
+      rows.append(r + tile.row0)
+      cols.append(c + tile.col0)
+   return np.concatenate(rows), np.concatenate(cols)
+
+
+class _ChangeIndex(object):
+   """Changed cells grouped by the tile holding them, for finding the cells near a tile."""
+
+   def __init__(self, rows, cols, shape, tile_size):
+      self.rows = np.asarray(rows, dtype=np.intp)
+      self.cols = np.asarray(cols, dtype=np.intp)
+      self.tile_size = tile_size
+      self.ny = -(-shape[0] // tile_size)
+      self.nx = -(-shape[1] // tile_size)
+      key = (self.rows // tile_size) * self.nx + self.cols // tile_size
+      self.order = np.argsort(key, kind="mergesort")
+      self.starts = np.searchsorted(key[self.order], np.arange(self.ny * self.nx + 1))
+      self.counts = np.diff(self.starts).reshape(self.ny, self.nx)
+
+   def _tiles(self, tile, reach):
+      d = -(-reach // self.tile_size)
+      ty, tx = tile.row0 // self.tile_size, tile.col0 // self.tile_size
+      return max(ty - d, 0), min(ty + d + 1, self.ny), max(tx - d, 0), min(tx + d + 1, self.nx)
+
+   def near(self, tile, reach):
+      """True if a changed cell lies in a tile within 'reach' cells of 'tile'."""
+      y0, y1, x0, x1 = self._tiles(tile, reach)
+      return self.counts[y0:y1, x0:x1].any()
+
+   def window(self, tile):
+      """Boolean array of the changed cells in the read window of 'tile'."""
+      y0, y1, x0, x1 = self._tiles(tile, max(tile.row0 - tile.read_row0, tile.col0 - tile.read_col0,
+                                             tile.read_row1 - tile.row1, tile.read_col1 - tile.col1))
+      idx = np.concatenate([self.order[self.starts[y * self.nx + x0]:self.starts[y * self.nx + x1]]
+                            for y in range(y0, y1)])
+      r = self.rows[idx] - tile.read_row0
+      c = self.cols[idx] - tile.read_col0
+      h, w = tile.read_row1 - tile.read_row0, tile.read_col1 - tile.read_col0
+      inside = (r >= 0) & (r < h) & (c >= 0) & (c < w)
+      change = np.zeros((h, w), dtype=bool)
+      change[r[inside], c[inside]] = True
+      return change
+
+
+def _affected(change, nbrs, inner):
+   """Cells of a tile interior whose window (each of 'nbrs') holds a changed cell of 'change'
+   (its read window). Circles: cells within the radius of a changed cell, from one distance
+   transform; rectangles: window sums of the changed cells."""
+   dist = edt(change)[0] if any(isinstance(nbr, Circle) for nbr in nbrs) else None
+   out = []
+   for nbr in nbrs:
+      if isinstance(nbr, Circle):
+         a = dist <= nbr.radius
+      else:
+         a = _window_sum(_integral(change, nbr.reach), change.shape, nbr.reach, nbr.spans()) > 0
+      out.append(a[inner])
+   return out
+
+
+def _means_at(layers, nbrs, cells, outside, mult, dtype, limits):
+   """Finished means (as landcover.summarize_block) of 'layers' at 'cells', a list of
+   (neighborhood index, rows, cols), 'limits' being the layers' landcover.layer_limits.
+   Yields (layer index, neighborhood index, rows, cols, values)."""
+   shape = layers[0].shape
+   valid = None
+   for i, layer in enumerate(layers):
+      # class layers share one NoData pattern, so their count tables are made once
+      if valid is None or not np.array_equal(layer_valid(layer), valid):
+         valid = layer_valid(layer)
+         counts = _integral(valid, 0)
+      # (the same fixed-point sums as focal.Pyramid, so values equal a full run's)
+      values, exp = summable(np.where(valid, layer, 0), nbrs, limits[i])
+      sums = _integral(values, 0)
+      for j, r, c in cells:
+         spans = nbrs[j].spans()
+         m = _divide(_window_sum_at(sums, shape, r, c, spans), _window_sum_at(counts, shape, r, c, spans), exp)
+         m[np.isnan(m)] = 0
+         if outside is not None:
+            m[outside[r, c]] = np.nan
+         yield i, j, r, c, _output(m, mult, dtype)
+
+
+def _box(affected, js, tile, shape, nbrs):
+   """Tile over the bounding box of the affected cells of neighborhoods 'js' in 'tile', with
+   the largest of their reaches as halo, and that box as (rows, cols) slices of the tile."""
+   rows = np.flatnonzero(np.any([affected[j].any(axis=1) for j in js], axis=0))
+   cols = np.flatnonzero(np.any([affected[j].any(axis=0) for j in js], axis=0))
+   box = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+   sub = Tile(tile.row0 + box[0].start, tile.row0 + box[0].stop, tile.col0 + box[1].start,
+              tile.col0 + box[1].stop, shape, max(nbrs[j].reach for j in js))
+   return sub, box
+
+
+def update_tiled(classified, lut, nbrs, out, rows, cols, extras=(), mask=None, nodata=None, tile_size=512, mult=None):
+   """Recompute the summaries in 'out' (a (layers, len(nbrs), rows, cols) array written by
+   landcover.summarize_tiled) that depend on the changed cells (rows, cols): for each
+   neighborhood, the cells whose window holds a changed cell. Inputs are the new
+   'classified', 'extras' and 'mask'. In each tile, means are computed over the bounding
+   box of the affected cells (plus the reach), or, where few cells are affected, at those
+   cells only. Returns the number of cells updated per neighborhood. Float layers are summed
+   at the scale of their largest absolute value (landcover.layer_limits): if that moves past
+   a power of two, the cells not updated differ from a full run in the last bits."""
+   shape = np.shape(classified)[-2:]
+   updated = [0] * len(nbrs)
+   index = _ChangeIndex(rows, cols, shape, tile_size)
+   if not len(index.rows):
+      return updated
+   limits = layer_limits(lut, extras, tile_size)
+   for t in iter_tiles(shape, tile_size):
+      # neighborhoods reaching a changed cell from this tile
+      near = [j for j, nbr in enumerate(nbrs) if index.near(t, nbr.reach)]
+      if not near:
+         continue
+      tile = Tile(t.row0, t.row1, t.col0, t.col1, shape, max(nbrs[j].reach for j in near))
+      affected = dict(zip(near, _affected(index.window(tile), [nbrs[j] for j in near], tile.inner)))
+      near = [j for j in near if affected[j].any()]
+      sparse = []
+      for j in near:
+         sub, box = _box(affected, [j], tile, shape, nbrs)
+         h, w = sub.read_row1 - sub.read_row0, sub.read_col1 - sub.read_col0
+         if affected[j].sum() < POINT_FRACTION * h * w:
+            sparse.append(j)
+      dense = [j for j in near if j not in sparse]
+      if dense:
+         sub, box = _box(affected, dense, tile, shape, nbrs)
+         read = sub.read_window
+         means = summarize_block(classified[read], lut, [nbrs[j] for j in dense], [e[read] for e in extras],
+                                 None if mask is None else mask[read], nodata, mult, out.dtype, limits)
+         for n, j in enumerate(dense):
+            a = affected[j][box]
+            dest = out[(slice(None), j) + sub.write_window]
+            dest[:, a] = means[(slice(None), n) + sub.inner][:, a]
+      if sparse:
+         sub, box = _box(affected, sparse, tile, shape, nbrs)
+         read = sub.read_window
+         layers = list(reclass_block(classified[read], lut, nodata))
+         layers.extend(compact(e[read]) for e in extras)
+         outside = None if mask is None else ~valid_mask(mask[read])
+         # affected cells, in read window coordinates
+         r0, c0 = sub.inner[0].start, sub.inner[1].start
+         cells = [(j,) + tuple(x + o for x, o in zip(np.nonzero(affected[j][box]), (r0, c0))) for j in sparse]
+         for i, j, r, c, m in _means_at(layers, nbrs, cells, outside, mult, out.dtype, limits):
+            out[i, j, r + sub.read_row0, c + sub.read_col0] = m
+      for j in near:
+         updated[j] += int(affected[j].sum())
+   return updated
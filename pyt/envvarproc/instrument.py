@@ -0,0 +1,192 @@
+# ----------------------------------------------------------------------------------------
+# instrument.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Timing spans for the tools' processing stages (clip, SetNull cleaning,
+# Reclassify, FocalStatistics, ExtractByMask, save, ...). A span records its
+# wall time, CPU time, the process's peak resident memory so far
+# (peak_rss_mb, a high-water mark over the process's lifetime) and how much
+# the span raised it (peak_rss_growth_mb: 0 for a span using less memory
+# than an earlier one), and (when the stage sets them) the cells processed
+# and bytes written. Spans nest; each
+# completed span is written as one JSON line, and summary() gives a table of
+# all spans, in run order, to show at the end of a tool run.
+
+# Usage Tips:
+#   trace = Tracer(log_file, arcpy.AddMessage)
+#   with trace.span("FocalStatistics", output=name) as s:
+#      ...
+#      s.cells = rows * cols
+#   trace.report()
+# Without a log file, spans are still timed (at negligible cost) but nothing
+# is written. CPU time is this process's (user + system); work done by worker
+# processes is recorded by the workers (see Tracer.record).
+
+# Dependencies:
+# none (peak memory: 'resource' on Unix, psapi through ctypes on Windows)
+# ----------------------------------------------------------------------------------------
+
+import json
+import os
+import sys
+import time
+
+
+def peak_rss_mb():
+   """Peak resident memory of this process in MB, or None where unavailable."""
+   try:
+      import resource
+   except ImportError:
+      return _peak_rss_windows()
+   peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+   # kilobytes on Linux, bytes on macOS
+   return peak / (1024. * 1024.) if sys.platform == "darwin" else peak / 1024.
+
+
+def _peak_rss_windows():
+   """Peak working set of this process in MB (GetProcessMemoryInfo), or None."""
+   try:
+      import ctypes
+      from ctypes import wintypes
+
+      class Counters(ctypes.Structure):
+         _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                     ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                     ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                     ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                     ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+      c = Counters()
+      c.cb = ctypes.sizeof(c)
+      process = ctypes.windll.kernel32.GetCurrentProcess()
+      if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(c), c.cb):
+         return None
+      return c.PeakWorkingSetSize / (1024. * 1024.)
+   except Exception:
+      return None
+
+
+def _growth(before, after):
+   """Increase of the peak memory from 'before' to 'after' (None if either is unknown)."""
+   return None if before is None or after is None else after - before
+
+
+def cpu_seconds():
+   """CPU time (user + system) used by this process so far."""
+   t = os.times()
+   return t[0] + t[1]
+
+
+def measure(func, *args, **kwargs):
+   """Run func(*args, **kwargs). Returns (result, stats), 'stats' being the span fields
+   (wall_s, cpu_s, peak_rss_mb, peak_rss_growth_mb) of the call, e.g. for a worker process
+   to send back."""
+   t0, c0, m0 = time.time(), cpu_seconds(), peak_rss_mb()
+   result = func(*args, **kwargs)
+   m1 = peak_rss_mb()
+   return result, {"wall_s": time.time() - t0, "cpu_s": cpu_seconds() - c0, "peak_rss_mb": m1,
+                   "peak_rss_growth_mb": _growth(m0, m1), "start": t0}
+
+
+class Span(object):
+   """One timed stage. Set 'cells' (cells processed) and 'bytes' (bytes written), or
+   call wrote(), inside the 'with' block."""
+
+   def __init__(self, tracer, name, attrs):
+      self.tracer = tracer
+      self.name = name
+      self.attrs = attrs
+      self.cells = None
+      self.bytes = None
+
+   def wrote(self, cells, nbytes):
+      """Add an output of 'cells' cells and 'nbytes' bytes (either may be None)."""
+      if cells is not None:
+         self.cells = (self.cells or 0) + cells
+      if nbytes is not None:
+         self.bytes = (self.bytes or 0) + nbytes
+
+   def __enter__(self):
+      self.depth = len(self.tracer.stack)
+      self.parent = self.tracer.stack[-1].name if self.tracer.stack else None
+      self.tracer.stack.append(self)
+      self.start = time.time()
+      self.cpu0 = cpu_seconds()
+      self.peak0 = peak_rss_mb()
+      return self
+
+   def __exit__(self, exc_type, exc, tb):
+      peak = peak_rss_mb()
+      stats = {"wall_s": time.time() - self.start, "cpu_s": cpu_seconds() - self.cpu0,
+               "peak_rss_mb": peak, "peak_rss_growth_mb": _growth(self.peak0, peak), "start": self.start}
+      self.tracer.stack.pop()
+      attrs = dict(self.attrs)
+      if exc_type is not None:
+         attrs["error"] = exc_type.__name__
+      self.tracer.record(self.name, stats, self.cells, self.bytes, self.depth, self.parent, **attrs)
+      return False
+
+
+class Tracer(object):
+   """Collects spans, writing each to JSON lines file 'path' (if given). 'message' (e.g.
+   arcpy.AddMessage) is used by report()."""
+
+   def __init__(self, path=None, message=None):
+      self.path = path
+      self.message = message
+      self.stack = []
+      self.spans = []
+      self.file = open(path, "a") if path else None
+
+   def span(self, name, **attrs):
+      """Context manager timing stage 'name'; 'attrs' (e.g. output=...) are recorded with it."""
+      return Span(self, name, attrs)
+
+   def record(self, name, stats, cells=None, nbytes=None, depth=None, parent=None, **attrs):
+      """Record a span measured elsewhere (e.g. by measure() in a worker process);
+      it is nested under the current span."""
+      if depth is None:
+         depth = len(self.stack)
+         parent = self.stack[-1].name if self.stack else None
+      rec = {"span": name, "depth": depth, "parent": parent, "cells": cells, "bytes": nbytes}
+      rec.update(stats)
+      rec.update(attrs)
+      self.spans.append(rec)
+      if self.file is not None:
+         self.file.write(json.dumps(rec, sort_keys=True, default=str) + "\n")
+         self.file.flush()
+      return rec
+
+   def summary(self):
+      """Lines of a table of the recorded spans, in run order (nested spans indented)."""
+      def num(v, fmt):
+         return fmt % v if v is not None else "-"
+
+      # spans are recorded as they end; order them by start time, outer spans first
+      spans = sorted(self.spans, key=lambda r: (r.get("start", 0), r["depth"]))
+      lines = ["%-48s %9s %9s %9s %9s %9s %9s" % ("stage", "wall s", "cpu s", "peak MB", "+peak MB", "Mcells",
+                                                  "MB out")]
+      for r in spans:
+         label = "  " * r["depth"] + r["span"]
+         for key in ("output", "layer", "neighborhood"):
+            if r.get(key) is not None:
+               label += " " + str(r[key])
+         lines.append("%-48s %9s %9s %9s %9s %9s %9s" % (
+            label[:48], num(r["wall_s"], "%.2f"), num(r["cpu_s"], "%.2f"), num(r["peak_rss_mb"], "%.0f"),
+            num(r.get("peak_rss_growth_mb"), "%.0f"), num(r["cells"] and r["cells"] / 1e6, "%.2f"),
+            num(r["bytes"] and r["bytes"] / 1048576., "%.1f")))
+      return lines
+
+   def report(self):
+      """Send summary() to 'message' (if given) and close the log file."""
+      if self.message is not None and self.spans:
+         for line in self.summary():
+            self.message(line)
+      self.close()
+
+   def close(self):
+      if self.file is not None:
+         self.file.close()
+         self.file = None
@@ -0,0 +1,182 @@
+# ----------------------------------------------------------------------------------------
+# landcover.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Array version of the neighborhood summary in reclassNLCD/reclassCCAP.
+# For each class layer (LUT reclass of the classified raster, plus optional
+# continuous layers such as impervious and canopy), and each neighborhood:
+#   FocalStatistics(layer, nbr, "MEAN", "DATA") -> Con(IsNull(x), 0, x) -> ExtractByMask(x, mask)
+# All neighborhoods of a layer come from one summed-area table (focal.Pyramid).
+# summarize_tiled runs this one tile at a time, with a halo equal to the
+# largest neighborhood reach, so memory use depends on the tile size rather
+# than the study area, and results equal the untiled summarize_block. Tiles
+# are summarized on a background thread while the next ones are read and
+# finished ones written (pipeline.py); reads and writes stay in the calling
+# thread, so inputs may be arcpy readers.
+# Integer-valued layers (uint8 LUT classes, percent layers) are summed as
+# exact integers, and float layers in fixed point at a scale set by the
+# layer's largest absolute value (layer_limits), which summarize_tiled takes
+# from the whole layer (reading the extra layers once more) so every tile
+# uses it. With a multiplier ('mult'), outputs are quantized as
+# finalizeEnvVar would (trunc(mean * mult + .5001)) into a small unsigned
+# integer type, NoData being the type's maximum, so they need no separate
+# finalize step.
+
+# Usage Tips:
+# Inputs (classified, extras, mask) can be any array-like objects supporting
+# 2D slicing (numpy arrays, memmaps, arcpy_io.RasterReader), aligned to the
+# same grid. 'out' is a writable (layers, neighborhoods, rows, cols) array.
+
+# Dependencies:
+# numpy
+# ----------------------------------------------------------------------------------------
+
+import numpy as np
+
+from .finalize import quantize
+from .focal import (Circle, Pyramid, Rectangle, focal_mean, neighborhood_suffix,
+                    parse_neighborhood, valid_mask)
+from .pipeline import DEPTH, run
+from .reclass import INT_NODATA, reclass_block
+from .tiles import iter_tiles
+
+# neighborhoods used by the land cover tools: (output name suffix, neighborhood)
+NEIGHBORHOODS = [("1", Rectangle(3, 3)), ("10", Circle(10)), ("100", Circle(100))]
+
+
+def neighborhoods(extra=()):
+   """NEIGHBORHOODS plus extra neighborhoods (objects or text for focal.parse_neighborhood),
+   as (suffix, neighborhood) pairs."""
+   nbrs = list(NEIGHBORHOODS)
+   for nbr in extra:
+      if not hasattr(nbr, "spans"):
+         nbr = parse_neighborhood(nbr)
+      nbrs.append((neighborhood_suffix(nbr), nbr))
+   return nbrs
+
+
+def compact(layer):
+   """A layer as uint8 (NoData: INT_NODATA) if its values are integers in 0-254, else as float32."""
+   layer = np.asarray(layer)
+   if layer.dtype == np.uint8:
+      return layer
+   valid = valid_mask(layer)
+   v = layer[valid]
+   if v.size and (v.min() < 0 or v.max() >= INT_NODATA or (v != np.floor(v)).any()):
+      return layer.astype(np.float32)
+   out = np.full(layer.shape, INT_NODATA, dtype=np.uint8)
+   out[valid] = v
+   return out
+
+
+def layer_valid(layer):
+   """Valid cells of a layer (float32 with NaN, or uint8 with INT_NODATA)."""
+   return valid_mask(layer, INT_NODATA if layer.dtype == np.uint8 else None)
+
+
+def layer_max(layer):
+   """Largest absolute value of the valid cells of a layer (see layer_valid), 0 if none."""
+   v = layer[layer_valid(layer)]
+   return float(np.abs(v).max()) if v.size else 0.
+
+
+def layer_limits(lut, extras=(), tile_size=1024):
+   """Largest absolute value of each layer (LUT classes, then 'extras', read one tile at a
+   time), which sets the fixed-point scale of its window sums (focal.summable): taken from
+   whole layers, it is the same in every tile."""
+   limits = [layer_max(compact(row)) for row in lut]
+   for e in extras:
+      tiles = iter_tiles(np.shape(e)[-2:], tile_size)
+      limits.append(max([layer_max(compact(e[t.write_window])) for t in tiles] + [0.]))
+   return limits
+
+
+def output_nodata(dtype):
+   """NoData of summary outputs of 'dtype': NaN for floats, else the type's maximum."""
+   dtype = np.dtype(dtype)
+   return np.nan if dtype.kind == "f" else np.iinfo(dtype).max
+
+
+def _output(m, mult=None, dtype=np.float32):
+   """A finished mean, quantized to 'dtype' if 'mult' is given. Means are rounded to float32
+   first, so values equal finalizeEnvVar's output for the float32 summary rasters."""
+   if mult is None:
+      return m
+   return quantize(m.astype(np.float32), mult, dtype, output_nodata(dtype))
+
+
+def summarize_block(classes, lut, nbrs, extras=(), mask=None, nodata=None, mult=None, dtype=np.float32, limits=None):
+   """Reclass, focal mean, fill NoData with 0 and mask one block. Returns a
+   (layers, len(nbrs), rows, cols) array of 'dtype' (float32, or with 'mult' an
+   unsigned integer type); layers are the LUT classes followed by 'extras'.
+   'limits': layer_limits of the whole layers, for a tile of them (default: of this block)."""
+   layers = list(reclass_block(classes, lut, nodata))
+   layers.extend(compact(e) for e in extras)
+   if limits is None:
+      limits = layer_limits(lut) + [layer_max(layer) for layer in layers[len(lut):]]
+   shape = np.shape(classes)
+   out = np.empty((len(layers), len(nbrs)) + shape, dtype=dtype)
+   outside = None if mask is None else ~valid_mask(mask)
+   pyramid = None
+   for i, layer in enumerate(layers):
+      # class layers share one NoData pattern, so their window counts are computed once
+      valid = layer_valid(layer)
+      if pyramid is None or not np.array_equal(valid, pyramid.valid):
+         pyramid = Pyramid(valid, nbrs)
+      for j, m in enumerate(pyramid.means(layer, limits[i])):
+         out[i, j] = _output(_finish(m, outside), mult, dtype)
+   return out
+
+
+def _finish(m, outside=None):
+   """Con(IsNull(m), 0, m), then NaN where 'outside' is True (ExtractByMask)."""
+   m[np.isnan(m)] = 0
+   if outside is not None:
+      m[outside] = np.nan
+   return m
+
+
+def neighborhood_mean(layer, nbr, outside=None, big=None):
+   """Focal mean of one layer, with NoData set to 0 and cells where 'outside' is True set to NaN.
+   'big': the layer_limits value of the whole layer, for a tile of it."""
+   layer = compact(layer)
+   return _finish(focal_mean(layer, nbr, INT_NODATA if layer.dtype == np.uint8 else None, big), outside)
+
+
+def summarize_tiled(classified, lut, nbrs, out, extras=(), mask=None, nodata=None, tile_size=1024, halo=None, mult=None,
+                    workers=1, depth=DEPTH, io_threads=False, limits=None):
+   """summarize_block over 'classified' one tile at a time, writing tile interiors to 'out'
+   (quantized to the type of 'out' if 'mult' is given). Tiles are summarized on 'workers'
+   background threads, up to 'depth' tiles ahead of the reads (0: all in this thread);
+   'io_threads' reads and writes on their own threads too, for inputs that do not call
+   arcpy (see pipeline.run). 'limits' (layer_limits) is read from the inputs if not given."""
+   if halo is None:
+      halo = max(nbr.reach for nbr in nbrs)
+   if limits is None:
+      limits = layer_limits(lut, extras, tile_size)
+
+   def read(tile):
+      read = tile.read_window
+      m = None if mask is None else mask[read]
+      if m is not None and not valid_mask(m[tile.inner]).any():
+         # tile is entirely outside the mask
+         return None
+      return classified[read], [e[read] for e in extras], m
+
+   def compute(blocks):
+      if blocks is None:
+         return None
+      classes, ext, m = blocks
+      return summarize_block(classes, lut, nbrs, ext, m, nodata, mult, out.dtype, limits)
+
+   def write(tile, block):
+      dest = (slice(None), slice(None)) + tile.write_window
+      if block is None:
+         out[dest] = output_nodata(out.dtype)
+      else:
+         out[dest] = block[(slice(None), slice(None)) + tile.inner]
+
+   run(iter_tiles(np.shape(classified)[-2:], tile_size, halo), compute, write, read, workers, depth, io_threads)
+   return out
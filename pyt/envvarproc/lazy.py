@@ -0,0 +1,221 @@
+# ----------------------------------------------------------------------------------------
+# lazy.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Deferred raster expressions for the array backend. Building an expression
+# (set_null, con, is_null, extract_by_mask, arithmetic, focal, ...) only
+# records a graph; nothing is read or computed until the expression is
+# evaluated or saved, which happens one block at a time. A chain of elementwise
+# operations is evaluated block by block in memory, so no full-size
+# intermediate (and no intermediate raster on disk) is ever made; a focal node
+# reads its input with a halo of the neighborhood reach around each block.
+
+# Usage Tips:
+# Expressions are 2D array-likes (they have .shape and support slicing), so
+# they can be passed anywhere the other modules accept a RasterReader or a
+# numpy array, e.g.
+#   cls = source(RasterReader("nlcd_cliptemp", ref))
+#   cls = set_null(equal_to(cls, 0), cls)
+#   imp = extract_by_mask(source(RasterReader(impervious, ref)), cls)
+#   set_null(equal_to(imp, 127), imp).save("nlcd_impervious_clean", ref)
+# A node used more than once in an expression is evaluated once per block.
+# NoData is NaN; conditions are true where non-zero (and not NoData).
+
+# Dependencies:
+# numpy
+# ----------------------------------------------------------------------------------------
+
+import numpy as np
+
+from .focal import focal_mean
+from .tiles import iter_tiles
+
+
+class Node(object):
+   """A deferred raster expression. Subclasses implement _block(window, memo)."""
+
+   # cells read around a block to evaluate it
+   halo = 0
+
+   def block(self, window, memo=None):
+      """Evaluate the window (row slice, col slice) as a float array with NoData as NaN."""
+      if memo is None:
+         memo = {}
+      key = (id(self), window[0].indices(self.shape[0]), window[1].indices(self.shape[1]))
+      if key not in memo:
+         memo[key] = self._block(window, memo)
+      return memo[key]
+
+   def __getitem__(self, window):
+      return self.block(window)
+
+   def evaluate(self, out=None, dtype=np.float32, tile_size=1024):
+      """Evaluate the whole expression into 'out' (by default a new array of 'dtype'), one block at a time."""
+      if out is None:
+         out = np.empty(self.shape, dtype=dtype)
+      for tile in iter_tiles(self.shape, tile_size):
+         out[tile.write_window] = self.block(tile.write_window)
+      return out
+
+   def save(self, out_raster, ref, nodata=-9999, dtype=np.float32, tile_size=1024):
+      """Evaluate and save to 'out_raster' (aligned to the RasterRef 'ref'). Returns the saved arcpy Raster."""
+      from .arcpy_io import write_raster
+      return write_raster(self.evaluate(dtype=dtype, tile_size=tile_size), ref, out_raster, nodata)
+
+   def __add__(self, other):
+      return Elementwise(np.add, self, other)
+
+   def __radd__(self, other):
+      return Elementwise(np.add, other, self)
+
+   def __sub__(self, other):
+      return Elementwise(np.subtract, self, other)
+
+   def __rsub__(self, other):
+      return Elementwise(np.subtract, other, self)
+
+   def __mul__(self, other):
+      return Elementwise(np.multiply, self, other)
+
+   def __rmul__(self, other):
+      return Elementwise(np.multiply, other, self)
+
+   def __truediv__(self, other):
+      return Elementwise(np.true_divide, self, other)
+
+   def __rtruediv__(self, other):
+      return Elementwise(np.true_divide, other, self)
+
+   __div__ = __truediv__
+   __rdiv__ = __rtruediv__
+
+   def __neg__(self):
+      return Elementwise(np.negative, self)
+
+
+class Source(Node):
+   """A 2D array-like (numpy array, memmap, arcpy_io.RasterReader) as an expression leaf.
+   Cells equal to 'nodata' are NoData."""
+
+   def __init__(self, arr, nodata=None):
+      self.arr = arr
+      self.nodata = nodata
+      self.shape = tuple(np.shape(arr))
+
+   def _block(self, window, memo):
+      b = np.array(self.arr[window], dtype=np.float64)
+      if self.nodata is not None:
+         b[b == self.nodata] = np.nan
+      return b
+
+
+class Elementwise(Node):
+   """func(*args) applied cell by cell; args are nodes or scalars. NoData (NaN) propagates
+   through arithmetic as in Map Algebra."""
+
+   def __init__(self, func, *args):
+      self.func = func
+      self.args = tuple(a if isinstance(a, Node) or np.isscalar(a) else Source(a) for a in args)
+      nodes = [a for a in self.args if isinstance(a, Node)]
+      self.shape = nodes[0].shape
+      self.halo = max(a.halo for a in nodes)
+
+   def _block(self, window, memo):
+      vals = [a.block(window, memo) if isinstance(a, Node) else a for a in self.args]
+      with np.errstate(invalid="ignore", divide="ignore"):
+         return self.func(*vals)
+
+
+class Focal(Node):
+   """Focal mean (FocalStatistics MEAN, ignoring NoData) of 'x'. Each block is computed from
+   the block plus a halo of the neighborhood reach, so results equal the whole-raster mean."""
+
+   def __init__(self, x, nbr):
+      self.x = x
+      self.nbr = nbr
+      self.shape = x.shape
+      self.halo = x.halo + nbr.reach
+
+   def _block(self, window, memo):
+      rows, cols = window
+      r0, r1 = rows.indices(self.shape[0])[:2]
+      c0, c1 = cols.indices(self.shape[1])[:2]
+      h = self.nbr.reach
+      rr0, rr1 = max(r0 - h, 0), min(r1 + h, self.shape[0])
+      cc0, cc1 = max(c0 - h, 0), min(c1 + h, self.shape[1])
+      m = focal_mean(self.x.block((slice(rr0, rr1), slice(cc0, cc1)), memo), self.nbr)
+      return m[r0 - rr0:r1 - rr0, c0 - cc0:c1 - cc0]
+
+
+def source(arr, nodata=None):
+   """Wrap an array-like as an expression (expressions are returned as they are)."""
+   return arr if isinstance(arr, Node) else Source(arr, nodata)
+
+
+def _true(c):
+   """Condition values as booleans: non-zero and not NoData."""
+   return (c != 0) & ~np.isnan(c)
+
+
+def _con(c, t, f):
+   return np.where(_true(c), t, f)
+
+
+def _set_null(c, f):
+   return np.where(_true(c), np.nan, f)
+
+
+def _is_null(x):
+   return np.isnan(x).astype(np.float64)
+
+
+def _compare(op):
+   def f(a, b):
+      out = op(a, b).astype(np.float64)
+      out[np.isnan(a) | np.isnan(b)] = np.nan
+      return out
+   return f
+
+
+def con(cond, true_value, false_value=np.nan):
+   """Con: 'true_value' where 'cond' is true, else 'false_value' (default NoData)."""
+   return Elementwise(_con, source(cond), true_value, false_value)
+
+
+def set_null(cond, false_value):
+   """SetNull: NoData where 'cond' is true, else 'false_value'."""
+   return Elementwise(_set_null, source(cond), false_value)
+
+
+def is_null(x):
+   """IsNull: 1 where 'x' is NoData, else 0."""
+   return Elementwise(_is_null, source(x))
+
+
+def extract_by_mask(x, mask):
+   """ExtractByMask: 'x' where 'mask' has data (or, for a boolean array, is True), else NoData."""
+   if getattr(mask, "dtype", None) == bool:
+      return set_null(Elementwise(np.logical_not, mask), x)
+   return set_null(is_null(mask), x)
+
+
+def equal_to(a, b):
+   """1 where a == b, 0 elsewhere, NoData where either is NoData."""
+   return Elementwise(_compare(np.equal), a, b)
+
+
+def greater_than(a, b):
+   """1 where a > b, 0 elsewhere, NoData where either is NoData."""
+   return Elementwise(_compare(np.greater), a, b)
+
+
+def trunc(x):
+   """Int: truncate toward zero (NoData stays NoData)."""
+   return Elementwise(np.trunc, source(x))
+
+
+def focal(x, nbr):
+   """FocalStatistics(x, nbr, 'MEAN', 'DATA')."""
+   return Focal(source(x), nbr)
@@ -0,0 +1,63 @@
+# ----------------------------------------------------------------------------------------
+# manifest.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Run manifest for resumable tool runs. A JSON file records each completed
+# stage and its outputs, together with a fingerprint of the run's inputs and
+# parameters. A re-run with the same fingerprint skips stages whose outputs
+# still exist and resumes from the first incomplete one; a run with different
+# inputs starts over.
+
+# Usage Tips:
+# Mark a stage complete only after its outputs are saved. The manifest is
+# rewritten (through a temporary file) after every stage, so a crash leaves
+# the last completed stage recorded.
+
+# Dependencies:
+# none
+# ----------------------------------------------------------------------------------------
+
+import json
+import os
+import time
+
+from .cache import cache_key
+
+
+def _write(path, data):
+   """Write JSON to 'path' through a temporary file, so the file is never left half-written."""
+   tmp = path + ".tmp"
+   with open(tmp, "w") as f:
+      json.dump(data, f, indent=1, sort_keys=True)
+   if os.path.exists(path):
+      os.remove(path)
+   os.rename(tmp, path)
+
+
+class Manifest(object):
+   """Completed stages of a run, stored in 'path'. 'inputs' (input fingerprints and
+   parameters) identify the run; 'exists' checks that a recorded output is still there."""
+
+   def __init__(self, path, inputs, exists=os.path.exists):
+      self.path = path
+      self.exists = exists
+      self.fingerprint = cache_key(*inputs)
+      self.stages = {}
+      if os.path.exists(path):
+         with open(path) as f:
+            data = json.load(f)
+         if data.get("fingerprint") == self.fingerprint:
+            self.stages = data.get("stages", {})
+      self.resumed = bool(self.stages)
+
+   def done(self, stage):
+      """True if 'stage' completed and all its outputs still exist."""
+      s = self.stages.get(stage)
+      return s is not None and all(self.exists(o) for o in s["outputs"])
+
+   def complete(self, stage, outputs=()):
+      """Record 'stage' as completed, with its outputs."""
+      self.stages[stage] = {"outputs": list(outputs), "time": time.time()}
+      _write(self.path, {"fingerprint": self.fingerprint, "stages": self.stages})
@@ -0,0 +1,176 @@
+# ----------------------------------------------------------------------------------------
+# parallel.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Runs the land cover neighborhood summary (landcover.py) as independent
+# (layer x neighborhood) jobs on a process pool. The reclassified layers (in
+# the LUT's type: uint8 class layers stay uint8, and keep their exact integer
+# window sums), the extra layers (float32) and the mask are staged once to
+# .npy memmaps in a scratch folder; workers open
+# them read-only and write their own (layer, neighborhood) slice of a shared
+# output memmap, so no arrays are pickled between processes. Output positions
+# (and so output names) depend only on the job's layer and neighborhood
+# index, not on the order in which jobs finish. With a multiplier ('mult'),
+# outputs are quantized into the type of the output array (see landcover.py).
+
+# Usage Tips:
+# Jobs are submitted largest neighborhood first, so the long 100-cell jobs
+# start before the short ones. workers=1 runs the jobs in this process.
+# Each job's wall time, CPU time and peak memory are measured in its worker
+# (instrument.measure) and recorded as a span of the calling process.
+
+# Dependencies:
+# numpy, concurrent.futures (Python 2.7: 'futures' backport)
+# ----------------------------------------------------------------------------------------
+
+import os
+import sys
+
+import numpy as np
+
+from .focal import neighborhood_suffix, valid_mask
+from .instrument import Tracer, measure
+from .landcover import _output, layer_limits, neighborhood_mean, output_nodata
+from .pipeline import run
+from .reclass import reclass_block
+from .tiles import iter_tiles
+
+
+def output_name(project_nm, basename, suffix):
+   """Name of a neighborhood summary output, e.g. 'proj_mean_water_100'."""
+   return project_nm + "_" + basename + "_" + suffix
+
+
+def _set_executable():
+   """Point multiprocessing at python(w).exe when running inside ArcMap/ArcGIS Pro,
+   where sys.executable is the application, not the interpreter."""
+   import multiprocessing
+   exe = os.path.basename(sys.executable).lower()
+   if sys.platform == "win32" and not exe.startswith("python"):
+      multiprocessing.set_executable(os.path.join(sys.exec_prefix, "pythonw.exe"))
+
+
+def stage_inputs(classified, lut, scratch, extras=(), mask=None, nodata=None, tile_size=2048, io_threads=False):
+   """Reclassify 'classified' into a (classes, rows, cols) memmap of the LUT's type, 'extras'
+   into a (extras, rows, cols) float32 memmap, and the mask into a boolean 'outside' memmap,
+   in folder 'scratch'. Returns the list of layer memmap paths (classes, then extras if any)
+   and the mask path (None without a mask). 'io_threads': read on a background thread
+   (inputs that do not call arcpy; see pipeline.run)."""
+   shape = tuple(np.shape(classified)[-2:])
+   layer_paths = [os.path.join(scratch, "classes.npy")]
+   layers = np.lib.format.open_memmap(layer_paths[0], "w+", lut.dtype, (lut.shape[0],) + shape)
+   extra_layers = None
+   if extras:
+      layer_paths.append(os.path.join(scratch, "extras.npy"))
+      extra_layers = np.lib.format.open_memmap(layer_paths[1], "w+", np.float32, (len(extras),) + shape)
+   outside_path = None
+   if mask is not None:
+      outside_path = os.path.join(scratch, "outside.npy")
+      outside = np.lib.format.open_memmap(outside_path, "w+", np.bool_, shape)
+
+   # tiles are reclassified on a background thread while the next ones are read
+   def read(tile):
+      win = tile.write_window
+      return classified[win], [e[win] for e in extras], None if mask is None else mask[win]
+
+   def compute(blocks):
+      classes, ext, m = blocks
+      return reclass_block(classes, lut, nodata), ext, None if m is None else ~valid_mask(m)
+
+   def write(tile, blocks):
+      win = tile.write_window
+      classes, ext, out = blocks
+      layers[(slice(None),) + win] = classes
+      for k, e in enumerate(ext):
+         extra_layers[(k,) + win] = e
+      if out is not None:
+         outside[win] = out
+
+   run(iter_tiles(shape, tile_size), compute, write, read, io_threads=io_threads)
+   # close the memmaps (assigned, not deleted: they are used by write above)
+   layers.flush()
+   layers = None
+   if extra_layers is not None:
+      extra_layers.flush()
+      extra_layers = None
+   if mask is not None:
+      outside.flush()
+      outside = None
+   return layer_paths, outside_path
+
+
+def _layer(layer_paths, i):
+   """Layer i of the staged layers (stage_inputs), as a read-only memmap."""
+   for path in layer_paths:
+      layers = np.load(path, mmap_mode="r")
+      if i < layers.shape[0]:
+         return layers[i]
+      i -= layers.shape[0]
+   raise IndexError("No staged layer %d" % i)
+
+
+def run_job(layer_paths, outside_path, out_path, i, j, nbr, tile_size=2048, mult=None, big=None):
+   """Compute neighborhood j of layer i, tile by tile, into out[i, j], 'big' being the layer's
+   landcover.layer_limits value. Runs in a worker process."""
+   layer = _layer(layer_paths, i)
+   outside = None if outside_path is None else np.load(outside_path, mmap_mode="r")
+   out = np.load(out_path, mmap_mode="r+")
+   for tile in iter_tiles(layer.shape, tile_size, nbr.reach):
+      read = tile.read_window
+      if outside is not None and outside[tile.write_window].all():
+         out[(i, j) + tile.write_window] = output_nodata(out.dtype)
+         continue
+      m = neighborhood_mean(layer[read], nbr, None if outside is None else outside[read], big)
+      out[(i, j) + tile.write_window] = _output(m[tile.inner], mult, out.dtype)
+   out.flush()
+   return i, j
+
+
+def summarize_parallel(classified, lut, nbrs, out_path, scratch, extras=(), mask=None, nodata=None,
+                       workers=None, tile_size=2048, mult=None, dtype=np.float32, tracer=None, layer_names=None,
+                       io_threads=False):
+   """Parallel equivalent of landcover.summarize_tiled. Writes a (layers, len(nbrs), rows, cols)
+   .npy file of 'dtype' (float32, or with 'mult' an unsigned integer type) to 'out_path' and
+   returns it opened as a memmap. With an instrument.Tracer, staging and each job (timed in
+   its worker) are recorded as spans, jobs labeled with 'layer_names' (default: indexes)."""
+   from concurrent.futures import ProcessPoolExecutor
+
+   if tracer is None:
+      tracer = Tracer()
+   with tracer.span("stage inputs") as s:
+      layer_paths, outside_path = stage_inputs(classified, lut, scratch, extras, mask, nodata, tile_size, io_threads)
+      s.cells = int(np.prod(np.shape(classified)[-2:]))
+   n_layers = lut.shape[0] + len(extras)
+   limits = layer_limits(lut, [_layer(layer_paths, i) for i in range(lut.shape[0], n_layers)], tile_size)
+   shape = tuple(np.shape(classified)[-2:])
+   out = np.lib.format.open_memmap(out_path, "w+", dtype, (n_layers, len(nbrs)) + shape)
+   del out
+
+   # largest neighborhoods first; ties in (layer, neighborhood) order
+   jobs = sorted(((i, j) for i in range(n_layers) for j in range(len(nbrs))),
+                 key=lambda ij: (-nbrs[ij[1]].reach, ij))
+   cells = int(np.prod(shape))
+
+   def done(result):
+      (i, j), stats = result
+      tracer.record("focal", stats, cells, cells * np.dtype(dtype).itemsize,
+                    layer=layer_names[i] if layer_names else i, neighborhood=neighborhood_suffix(nbrs[j]))
+
+   if workers == 1:
+      for i, j in jobs:
+         done(measure(run_job, layer_paths, outside_path, out_path, i, j, nbrs[j], tile_size, mult, limits[i]))
+   else:
+      _set_executable()
+      with ProcessPoolExecutor(max_workers=workers) as pool:
+         futures = [pool.submit(measure, run_job, layer_paths, outside_path, out_path, i, j, nbrs[j], tile_size, mult,
+                                limits[i]) for i, j in jobs]
+         for f in futures:
+            done(f.result())
+
+   for path in layer_paths:
+      os.remove(path)
+   if outside_path is not None:
+      os.remove(outside_path)
+   return np.load(out_path, mmap_mode="r+")
@@ -0,0 +1,257 @@
+# ----------------------------------------------------------------------------------------
+# pipeline.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Streaming read -> compute -> write stages, so that reading the next input
+# blocks and writing finished ones overlap the computation of the current one.
+# By default the calling thread reads and writes, and the computation runs on
+# a background thread (or a thread pool of 'workers'): the calling thread
+# reads the next items while earlier ones are computed, and writes the
+# results, in input order, as they finish. With io_threads=True a reader
+# thread reads items ahead and a writer thread writes the results, while the
+# calling thread computes, so reads and writes also overlap each other.
+# At most 'depth' items are read ahead (and, with io_threads, at most 'depth'
+# results wait to be written), so memory stays bounded when one stage is
+# slower than the others. The first error in any stage stops the pipeline and
+# is raised in the calling thread.
+
+# Usage Tips:
+#   pipeline.run(tiles, compute, write, read=read)
+# numpy releases the GIL in its heavy steps, and file/network I/O releases it
+# too, so the stages run concurrently within one process. arcpy is not
+# thread-safe: when read() or write() (or advancing 'items') call arcpy, keep
+# the default, which calls them in the calling thread only; compute() must
+# then be pure numpy. io_threads=True is for numpy, memmap and GDAL
+# (raster_io) I/O. With depth=0 everything runs in the calling thread, one
+# item at a time.
+
+# Dependencies:
+# none (workers > 1: concurrent.futures; Python 2.7: 'futures' backport)
+# ----------------------------------------------------------------------------------------
+
+import collections
+import sys
+import threading
+
+try:
+   import queue
+except ImportError:
+   # Python 2.7
+   import Queue as queue
+
+# default number of items read ahead (and of results queued for writing)
+DEPTH = 2
+
+# end of the input, or of the results
+_END = object()
+
+
+class _Result(object):
+   """A computed result, standing in for a Future when computing in the calling thread."""
+
+   def __init__(self, value):
+      self.value = value
+
+   def result(self):
+      return self.value
+
+
+class _Future(object):
+   """Result of a call submitted to a _ComputeThread."""
+
+   def __init__(self):
+      self.event = threading.Event()
+      self.value = None
+      self.error = None
+
+   def done(self):
+      return self.event.is_set()
+
+   def result(self):
+      self.event.wait()
+      if self.error is not None:
+         _raise(self.error)
+      return self.value
+
+
+class _ComputeThread(threading.Thread):
+   """Daemon thread running submitted calls one at a time, in order (a one-worker pool
+   that needs no concurrent.futures)."""
+
+   def __init__(self):
+      threading.Thread.__init__(self, name="pipeline compute")
+      self.daemon = True
+      self.calls = queue.Queue()
+      self.start()
+
+   def submit(self, func, *args):
+      f = _Future()
+      self.calls.put((f, func, args))
+      return f
+
+   def run(self):
+      while True:
+         call = self.calls.get()
+         if call is None:
+            return
+         f, func, args = call
+         try:
+            f.value = func(*args)
+         except BaseException:
+            f.error = sys.exc_info()
+         f.event.set()
+
+   def shutdown(self, wait=True):
+      self.calls.put(None)
+      if wait:
+         self.join()
+
+
+class _Stage(threading.Thread):
+   """Daemon thread running 'target'. An error is kept (as exception info) and sets 'stop'."""
+
+   def __init__(self, target, name, stop):
+      threading.Thread.__init__(self, name=name)
+      self.daemon = True
+      self.func = target
+      self.stop = stop
+      self.error = None
+
+   def run(self):
+      try:
+         self.func()
+      except BaseException:
+         self.error = sys.exc_info()
+         self.stop.set()
+
+
+def _raise(error):
+   """Re-raise the exception info of a failed stage (with its traceback, in both Pythons)."""
+   if sys.version_info[0] < 3:
+      exec("raise error[0], error[1], error[2]")
+   raise error[1].with_traceback(error[2])
+
+
+def _put(q, item, stop):
+   """Put 'item' on bounded queue 'q', unless the pipeline stops while waiting. Returns False if it stopped."""
+   while not stop.is_set():
+      try:
+         q.put(item, timeout=.1)
+         return True
+      except queue.Full:
+         pass
+   return False
+
+
+def _get(q, stop):
+   """Next item of queue 'q', or _END if the pipeline stops while waiting."""
+   while not stop.is_set():
+      try:
+         return q.get(timeout=.1)
+      except queue.Empty:
+         pass
+   return _END
+
+
+def _pool(workers):
+   if workers > 1:
+      from concurrent.futures import ThreadPoolExecutor
+      return ThreadPoolExecutor(max_workers=workers)
+   return _ComputeThread()
+
+
+def _run_here(items, compute, write, read, workers, depth):
+   """run() with reads and writes in the calling thread, and the compute on other threads."""
+   n = 0
+   pending = collections.deque()
+   pool = _pool(workers)
+   try:
+      for item in items:
+         pending.append((item, pool.submit(compute, read(item))))
+         # write the finished results, in order; wait for the oldest when 'depth' are ahead
+         while pending and (len(pending) > depth or pending[0][1].done()):
+            item, result = pending.popleft()
+            write(item, result.result())
+            n += 1
+      while pending:
+         item, result = pending.popleft()
+         write(item, result.result())
+         n += 1
+   finally:
+      pool.shutdown(wait=True)
+   return n
+
+
+def run(items, compute, write, read=None, workers=1, depth=DEPTH, io_threads=False):
+   """For each of 'items' (any iterable; it may be a generator that does the reading):
+   data = read(item) (the item itself if 'read' is None), result = compute(data), then
+   write(item, result), in input order. By default reading (and advancing 'items') and
+   writing run in the calling thread and the compute on a background thread ('workers'
+   threads); with 'io_threads', reading and writing run on their own threads and the
+   compute in the calling thread (or on 'workers' threads). Returns the number of items written."""
+   if read is None:
+      read = lambda item: item
+
+   if depth == 0:
+      n = 0
+      for item in items:
+         write(item, compute(read(item)))
+         n += 1
+      return n
+   if not io_threads:
+      return _run_here(items, compute, write, read, workers, depth)
+
+   stop = threading.Event()
+   inputs = queue.Queue(depth)
+   results = queue.Queue(depth)
+   written = [0]
+
+   def reader():
+      it = iter(items)
+      while not stop.is_set():
+         item = next(it, _END)
+         if item is _END:
+            break
+         if not _put(inputs, (item, read(item)), stop):
+            return
+      _put(inputs, _END, stop)
+
+   def writer():
+      while True:
+         nxt = _get(results, stop)
+         if nxt is _END:
+            return
+         item, result = nxt
+         write(item, result.result())
+         written[0] += 1
+
+   stages = [_Stage(reader, "pipeline reader", stop), _Stage(writer, "pipeline writer", stop)]
+   pool = _pool(workers) if workers > 1 else None
+   for s in stages:
+      s.start()
+   try:
+      while True:
+         nxt = _get(inputs, stop)
+         if nxt is _END:
+            break
+         item, data = nxt
+         # hand the compute to the pool (results are still written in input order), or
+         # compute here while the reader and the writer work
+         result = pool.submit(compute, data) if pool is not None else _Result(compute(data))
+         if not _put(results, (item, result), stop):
+            break
+      if not stop.is_set():
+         _put(results, _END, stop)
+         stages[1].join()
+   finally:
+      stop.set()
+      for s in stages:
+         s.join()
+      if pool is not None:
+         pool.shutdown(wait=True)
+   for s in stages:
+      if s.error is not None:
+         _raise(s.error)
+   return written[0]
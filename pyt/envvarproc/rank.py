@@ -0,0 +1,202 @@
+# ----------------------------------------------------------------------------------------
+# rank.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Focal MEDIAN, MAJORITY, MINIMUM and MAXIMUM over circular windows, evaluated
+# at selected cells (the NoData cells being filled) with sliding histograms
+# (Huang's algorithm, with Perreault's two-level histogram for rank queries).
+# Values are quantized to their ranks among the distinct values in the area
+# read, so results are exact. The cells are grouped into row runs; a window
+# histogram is built once per run and moved one column at a time by adding
+# the cells entering on the right and removing those leaving on the left of
+# each window row, O(radius) per cell instead of O(radius^2). Short gaps in a
+# run are slid over when that is cheaper than rebuilding the histogram. Many
+# runs are moved together as rows of one histogram array.
+
+# Usage Tips:
+# Median is the mean of the two middle values for an even count (np.nanmedian);
+# majority ties go to the lowest value. MAJORITY scans the whole histogram per
+# cell, so it is meant for categorical data (see MAX_MAJORITY_BINS).
+
+# Dependencies:
+# numpy
+# ----------------------------------------------------------------------------------------
+
+import math
+
+import numpy as np
+
+# statistics computed here
+STATISTICS = ('MAJORITY', 'MEDIAN', 'MAXIMUM', 'MINIMUM')
+
+# distinct values above which focal_rank_at refuses MAJORITY (callers gather windows instead)
+MAX_MAJORITY_BINS = 4096
+
+# histogram cells held at once (sets how many runs are moved together)
+BATCH_CELLS = 2 ** 22
+
+
+def _runs(rows, cols, join):
+   """Group cells into row runs. Returns (order, run of each sorted cell, step of each
+   sorted cell, run rows, run first cols, run lengths); cells of a row less than 'join'
+   columns apart share a run (the columns between them are slid over)."""
+   order = np.lexsort((cols, rows))
+   r, c = rows[order], cols[order]
+   new = np.ones(len(r), dtype=bool)
+   new[1:] = (r[1:] != r[:-1]) | (c[1:] - c[:-1] > join)
+   starts = np.flatnonzero(new)
+   ends = np.append(starts[1:], len(c)) - 1
+   run = np.cumsum(new) - 1
+   step = c - c[starts][run]
+   return order, run, step, r[starts], c[starts], c[ends] - c[starts] + 1
+
+
+class _Histograms(object):
+   """Window histograms of a batch of n runs (one row per run), over 'blocks' blocks of
+   'block' bins plus a last bin for NoData, with block counts (Perreault) for rank queries."""
+
+   def __init__(self, n, blocks, block):
+      self.block = block
+      self.blocks = blocks
+      self.width = blocks * block + 1
+      self.fine = np.zeros((n, self.width), dtype=np.int32)
+      self.coarse = np.zeros((n, self.blocks + 1), dtype=np.int32)
+
+   def fill(self, a, b, cells):
+      """Set the histograms of runs a..b-1 from 'cells', a (b - a, window) array of bins."""
+      m = b - a
+      flat = (np.arange(m)[:, None] * self.width + cells).ravel()
+      self.fine[a:b] += np.bincount(flat, minlength=m * self.width).reshape(m, self.width).astype(np.int32)
+      self.coarse[a:b, :self.blocks] = self.fine[a:b, :-1].reshape(m, self.blocks, self.block).sum(axis=2)
+
+   def update(self, n, added, removed):
+      """Add bins 'added' and remove bins 'removed' ((n, k) arrays) for runs 0..n-1."""
+      run = np.arange(n)[:, None]
+      np.add.at(self.fine, (run, added), 1)
+      np.subtract.at(self.fine, (run, removed), 1)
+      np.add.at(self.coarse, (run, added // self.block), 1)
+      np.subtract.at(self.coarse, (run, removed // self.block), 1)
+
+   def counts(self, runs):
+      return self.coarse[runs, :self.blocks].sum(axis=1)
+
+   def kth(self, runs, k):
+      """Bin of the k-th smallest value (0-based) in the histograms of 'runs'."""
+      cum = np.cumsum(self.coarse[runs, :self.blocks], axis=1)
+      blk = (cum <= k[:, None]).sum(axis=1)
+      blk = np.minimum(blk, self.blocks - 1)
+      before = np.where(blk > 0, cum[np.arange(len(runs)), np.maximum(blk - 1, 0)], 0)
+      fine = self.fine[runs[:, None], blk[:, None] * self.block + np.arange(self.block)]
+      pos = (np.cumsum(fine, axis=1) <= (k - before)[:, None]).sum(axis=1)
+      return blk * self.block + np.minimum(pos, self.block - 1)
+
+   def mode(self, runs):
+      """Most frequent bin in the histograms of 'runs' (ties -> lowest bin) and its count."""
+      h = self.fine[runs, :-1]
+      best = np.argmax(h, axis=1)
+      return best, h[np.arange(len(runs)), best]
+
+
+def _stat(hist, runs, typ, values):
+   """Statistic 'typ' of the windows of 'runs' (NaN where a window has no data)."""
+   out = np.full(len(runs), np.nan)
+   if typ == 'MAJORITY':
+      best, count = hist.mode(runs)
+      has = count > 0
+      out[has] = values[best[has]]
+      return out
+   n = hist.counts(runs)
+   has = n > 0
+   runs, n = runs[has], n[has]
+   if typ == 'MEDIAN':
+      lo = values[hist.kth(runs, (n - 1) // 2)]
+      hi = values[hist.kth(runs, n // 2)]
+      out[has] = (lo + hi) / 2.
+   elif typ == 'MINIMUM':
+      out[has] = values[hist.kth(runs, np.zeros_like(n))]
+   else:
+      out[has] = values[hist.kth(runs, n - 1)]
+   return out
+
+
+def focal_rank_at(arr, valid, rows, cols, nbr, typ):
+   """Focal statistic 'typ' (see STATISTICS) of 'arr' (cells where 'valid') over circle
+   'nbr', at cells (rows, cols), by sliding histograms. Returns a float64 array, NaN
+   where the window has no data. Raises ValueError for MAJORITY over more than
+   MAX_MAJORITY_BINS distinct values."""
+   if typ not in STATISTICS:
+      raise ValueError("Unsupported focal statistic: " + str(typ))
+   rows = np.asarray(rows, dtype=np.intp)
+   cols = np.asarray(cols, dtype=np.intp)
+   out = np.full(len(rows), np.nan)
+   if not len(rows):
+      return out
+   reach = nbr.reach
+   h, w = arr.shape
+
+   # area read: the cells' bounding box plus the window reach
+   r0, r1 = max(rows.min() - reach, 0), min(rows.max() + reach + 1, h)
+   c0, c1 = max(cols.min() - reach, 0), min(cols.max() + reach + 1, w)
+   sub_valid = valid[r0:r1, c0:c1]
+   values, ranks = np.unique(arr[r0:r1, c0:c1][sub_valid], return_inverse=True)
+   if not len(values):
+      return out
+   if typ == 'MAJORITY' and len(values) > MAX_MAJORITY_BINS:
+      raise ValueError("Too many distinct values for a MAJORITY histogram: %d" % len(values))
+   block = len(values) if typ == 'MAJORITY' else int(math.ceil(math.sqrt(len(values))))
+   blocks = -(-len(values) // block)
+   nodata_bin = blocks * block
+
+   # bins of the area, padded by the reach (NoData and outside the raster -> nodata_bin)
+   bins = np.full((r1 - r0 + 2 * reach, c1 - c0 + 2 * reach), nodata_bin, dtype=np.int32)
+   bins[reach:reach + r1 - r0, reach:reach + c1 - c0][sub_valid] = ranks.ravel()
+   # padded coordinates of a cell: (row - r0 + reach, col - c0 + reach)
+   off_r = reach - r0
+   off_c = reach - c0
+
+   # window rows (dy) and half widths; cells entering/leaving when moving one column right
+   dys = np.arange(-reach, reach + 1)
+   hws = np.array([nbr.halfwidth(abs(dy)) for dy in dys])
+   win = np.array([(dy, dx) for dy, hw in zip(dys, hws) for dx in range(-hw, hw + 1)])
+
+   # join cells up to half a window apart (sliding over the gap costs less than a rebuild)
+   order, run, step, run_row, run_col, run_len = _runs(rows, cols, max(1, reach // 2))
+   # longest runs first, so the runs still moving are always a prefix of the batch
+   by_len = np.argsort(-run_len, kind="mergesort")
+   rank_of = np.empty_like(by_len)
+   rank_of[by_len] = np.arange(len(by_len))
+   run = rank_of[run]
+   run_row, run_col, run_len = run_row[by_len], run_col[by_len], run_len[by_len]
+
+   batch = max(1, BATCH_CELLS // (nodata_bin + 1))
+   by_run = np.argsort(run, kind="mergesort")
+   batch_start = np.searchsorted(run[by_run], np.arange(0, len(run_len) + batch, batch))
+   for a in range(0, len(run_len), batch):
+      b = min(a + batch, len(run_len))
+      hist = _Histograms(b - a, blocks, block)
+      y = run_row[a:b] + off_r
+      x = run_col[a:b] + off_c
+      # initial windows, a few runs at a time
+      chunk = max(1, 2 ** 22 // len(win))
+      for i in range(0, b - a, chunk):
+         j = min(i + chunk, b - a)
+         hist.fill(i, j, bins[y[i:j, None] + win[:, 0], x[i:j, None] + win[:, 1]])
+      # cells of the batch, by step
+      cells = by_run[batch_start[a // batch]:batch_start[a // batch + 1]]
+      cells = cells[np.argsort(step[cells], kind="mergesort")]
+      cell_step = step[cells]
+      lengths = run_len[a:b]
+      for s in range(int(lengths[0])):
+         lo, hi = np.searchsorted(cell_step, [s, s + 1])
+         if hi > lo:
+            q = cells[lo:hi]
+            out[order[q]] = _stat(hist, run[q] - a, typ, values)
+         moving = int((lengths > s + 1).sum())
+         if not moving:
+            break
+         yy = y[:moving, None] + dys
+         xx = x[:moving, None] + s
+         hist.update(moving, bins[yy, xx + hws + 1], bins[yy, xx - hws])
+   return out
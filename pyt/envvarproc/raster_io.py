@@ -0,0 +1,175 @@
+# ----------------------------------------------------------------------------------------
+# raster_io.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Raster input/output without arcpy, for the command line runs (cli.py):
+# the same interface as arcpy_io (RasterReader, read_raster, write_raster,
+# with RasterRef georeferences) for GeoTIFF files, through GDAL's Python
+# bindings, and for .npy arrays, whose georeference and NoData value are kept
+# in a JSON sidecar (<name>.json). A RasterReader reads only the window it is
+# sliced with; reading on another grid ('ref') needs the same cell size and
+# aligned cells (no resampling), cells outside the raster being NoData.
+
+# Usage Tips:
+# GDAL is only imported to read or write a GeoTIFF; .npy rasters (and array
+# stores, store.py) need numpy alone. An .npy file without a sidecar is read
+# on a grid of unit cells with its lower-left corner at (0, 0).
+
+# Dependencies:
+# numpy (GeoTIFF: GDAL Python bindings, osgeo.gdal)
+# ----------------------------------------------------------------------------------------
+
+import json
+import os
+
+import numpy as np
+
+from .arcpy_io import RasterRef
+from .tiles import iter_tiles
+
+# GDAL data types of the numpy types written by the tools (finalize.INT_TYPES and floats).
+# int8 is written as Int16, GDAL having no signed byte type before 3.7 (values and the
+# NoData value -128 are unchanged); Int64 needs GDAL 3.5 or later.
+GDAL_TYPES = {"uint8": "Byte", "int8": "Int16", "uint16": "UInt16", "int16": "Int16", "uint32": "UInt32",
+              "int32": "Int32", "int64": "Int64", "float32": "Float32", "float64": "Float64"}
+
+
+def _gdal():
+   try:
+      from osgeo import gdal
+   except ImportError:
+      raise ImportError("GeoTIFF input/output without arcpy needs the GDAL Python bindings (osgeo.gdal); "
+                        "use .npy rasters or an array store otherwise")
+   gdal.UseExceptions()
+   return gdal
+
+
+def is_npy(path):
+   return path.lower().endswith(".npy")
+
+
+def sidecar(path):
+   """JSON sidecar of an .npy raster (its RasterRef and NoData value)."""
+   return os.path.splitext(path)[0] + ".json"
+
+
+def _grid_of(ds):
+   """RasterRef of a GDAL dataset (north-up)."""
+   x0, cw, _, y1, _, ch = ds.GetGeoTransform()
+   rows, cols = ds.RasterYSize, ds.RasterXSize
+   return RasterRef(x0, y1 + ch * rows, cw, -ch, rows, cols, ds.GetProjection() or None)
+
+
+class RasterReader(object):
+   """Read-only 2D array-like view of a GeoTIFF or .npy raster on the grid of 'ref'
+   (default: the raster's own grid). Slicing reads only that window, as float64 with
+   NoData (and cells outside the raster) as NaN."""
+
+   def __init__(self, raster, ref=None):
+      self.raster = raster
+      if is_npy(raster):
+         self.arr = np.load(raster, mmap_mode="r")
+         self.nodata = None
+         own = RasterRef(0., 0., 1., 1., self.arr.shape[0], self.arr.shape[1])
+         if os.path.exists(sidecar(raster)):
+            with open(sidecar(raster)) as f:
+               data = json.load(f)
+            own = RasterRef.from_dict(data["ref"])
+            self.nodata = data.get("nodata")
+      else:
+         self.ds = _gdal().Open(raster)
+         self.band = self.ds.GetRasterBand(1)
+         self.nodata = self.band.GetNoDataValue()
+         own = _grid_of(self.ds)
+      self.own = own
+      self.ref = ref or own
+      self.offset = own.offset(self.ref, raster)
+      self.shape = (self.ref.rows, self.ref.cols)
+
+   def _read(self, r0, r1, c0, c1):
+      if is_npy(self.raster):
+         return self.arr[r0:r1, c0:c1]
+      return self.band.ReadAsArray(c0, r0, c1 - c0, r1 - r0)
+
+   def __getitem__(self, window):
+      rows, cols = window
+      r0, r1 = rows.indices(self.shape[0])[:2]
+      c0, c1 = cols.indices(self.shape[1])[:2]
+      out = np.full((max(r1 - r0, 0), max(c1 - c0, 0)), np.nan)
+      # the part of the window within the raster, in the raster's own rows and columns
+      dr, dc = self.offset
+      rr0, rr1 = max(r0 + dr, 0), min(r1 + dr, self.own.rows)
+      cc0, cc1 = max(c0 + dc, 0), min(c1 + dc, self.own.cols)
+      if rr1 > rr0 and cc1 > cc0:
+         arr = np.asarray(self._read(rr0, rr1, cc0, cc1), dtype=np.float64)
+         if self.nodata is not None:
+            arr = np.where(arr == self.nodata, np.nan, arr)
+         out[rr0 - dr - r0:rr1 - dr - r0, cc0 - dc - c0:cc1 - dc - c0] = arr
+      return out
+
+
+def raster_ref(raster):
+   """RasterRef of a GeoTIFF or .npy raster."""
+   return RasterReader(raster).own
+
+
+def value_range(raster):
+   """(min, max) of a GeoTIFF from its statistics, or None if it has none (or is an .npy)."""
+   if is_npy(raster):
+      return None
+   band = _gdal().Open(raster).GetRasterBand(1)
+   lo, hi = band.GetMetadataItem("STATISTICS_MINIMUM"), band.GetMetadataItem("STATISTICS_MAXIMUM")
+   if lo is None or hi is None:
+      return None
+   return float(lo), float(hi)
+
+
+def read_raster(raster):
+   """Read a raster into a float64 array with NoData as NaN. Returns (array, RasterRef)."""
+   reader = RasterReader(raster)
+   return reader[:, :], reader.ref
+
+
+def write_raster(arr, ref, out_raster, nodata=-9999, tile_size=2048):
+   """Save a 2D array-like to GeoTIFF or .npy 'out_raster', aligned to 'ref', one tile
+   of rows at a time. Float arrays use NaN for NoData (written as 'nodata' to a GeoTIFF,
+   kept as NaN in an .npy); integer arrays are written as they are, with 'nodata' as
+   their NoData value. Returns 'out_raster'."""
+   dtype = np.dtype(getattr(arr, "dtype", np.float64))
+   shape = (ref.rows, ref.cols)
+   if is_npy(out_raster):
+      out = np.lib.format.open_memmap(out_raster, "w+", dtype, shape)
+      for tile in iter_tiles(shape, tile_size):
+         out[tile.write_window] = arr[tile.write_window]
+      out.flush()
+      del out
+      with open(sidecar(out_raster), "w") as f:
+         json.dump({"ref": ref.to_dict(), "nodata": None if dtype.kind == "f" else nodata}, f,
+                   indent=1, sort_keys=True)
+      return out_raster
+   gdal = _gdal()
+   if dtype.name not in GDAL_TYPES and dtype.kind == "f":
+      dtype = np.dtype(np.float64)
+   gdal_type = getattr(gdal, "GDT_" + GDAL_TYPES.get(dtype.name, ""), None)
+   if gdal_type is None:
+      raise ValueError("Cannot write %s rasters with GDAL %s" % (dtype.name, gdal.__version__))
+   ds = gdal.GetDriverByName("GTiff").Create(out_raster, ref.cols, ref.rows, 1, gdal_type,
+                                             ["COMPRESS=LZW", "TILED=YES", "BIGTIFF=IF_SAFER"])
+   ds.SetGeoTransform((ref.x_min, ref.cell_width, 0., ref.y_min + ref.rows * ref.cell_height, 0., -ref.cell_height))
+   sr = ref.spatial_reference
+   if sr is not None:
+      sr = sr.exportToString() if hasattr(sr, "exportToString") else sr
+      # (arcpy spatial reference strings: WKT, then ';' and the coordinate domains)
+      ds.SetProjection(sr.split(";")[0])
+   band = ds.GetRasterBand(1)
+   band.SetNoDataValue(nodata)
+   for tile in iter_tiles(shape, tile_size):
+      block = np.asarray(arr[tile.write_window])
+      if dtype.kind == "f":
+         block = np.where(np.isnan(block), nodata, block)
+      band.WriteArray(block.astype(dtype, copy=False), tile.col0, tile.row0)
+   band.FlushCache()
+   ds = None
+   return out_raster
@@ -0,0 +1,250 @@
+# ----------------------------------------------------------------------------------------
+# schemes.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Registry of land cover classification schemes for the land cover summary
+# tools: NLCD 1992, NLCD 2001 (2001/2006/2011...), CCAP, plus custom schemes
+# from JSON files. A scheme lists its class codes, the codes set to NoData,
+# and its summary classes; each class gives a weight to some codes (e.g.
+# mixed forest: deciduous 100, mixed 50) and 0 to all others. Any subset of
+# classes compiles to RemapValue tables (arcpy backend) or to one dense LUT
+# (reclass.build_lut), so all classes are reclassified in a single pass.
+
+# Usage Tips:
+# Custom scheme file (JSON):
+#   {"name": "MyLC", "prefix": "mylc", "nodata": [0],
+#    "codes": [0, 1, 2, 3],
+#    "classes": [{"name": "water", "basename": "mean_water", "weights": {"1": 1}},
+#                {"name": "woody", "weights": {"2": 100, "3": 50}, "default": false}]}
+# 'basename' defaults to "mean_<name>_n" and 'default' (summarized unless
+# classes are chosen) to true. Class names become part of output names.
+
+# Dependencies:
+# numpy
+# ----------------------------------------------------------------------------------------
+
+import json
+import os
+
+import numpy as np
+
+
+class LandCoverClass(object):
+   """Summary class: 'weights' maps class codes to output values (others -> 0);
+   outputs are named <project>_<basename>_<neighborhood>."""
+
+   def __init__(self, name, weights, basename=None, default=True):
+      self.name = name
+      self.weights = dict((int(k), v) for k, v in weights.items())
+      self.basename = basename or "mean_" + name + "_n"
+      self.default = default
+
+   def to_dict(self):
+      return {"name": self.name, "basename": self.basename, "default": self.default,
+              "weights": dict((str(k), v) for k, v in sorted(self.weights.items()))}
+
+   def __repr__(self):
+      return "LandCoverClass(%r)" % self.name
+
+
+class Scheme(object):
+   """Classification scheme: class 'codes', 'nodata' codes (SetNull before summarizing),
+   summary 'classes' (LandCoverClass), and the 'prefix' of its intermediate datasets."""
+
+   def __init__(self, name, codes, classes, nodata=(0,), prefix=None):
+      self.name = name
+      self.codes = [int(c) for c in codes]
+      self.nodata = [int(c) for c in nodata]
+      self.classes = list(classes)
+      self.prefix = prefix or name.lower()
+      for c in self.classes:
+         unknown = set(c.weights) - set(self.codes)
+         if unknown:
+            raise ValueError("Class %s of scheme %s uses unknown codes: %s" % (c.name, name, sorted(unknown)))
+
+   def names(self):
+      return [c.name for c in self.classes]
+
+   def select(self, names=None):
+      """Classes named 'names' (in the scheme's order), or the default classes."""
+      if not names:
+         return [c for c in self.classes if c.default]
+      unknown = set(names) - set(self.names())
+      if unknown:
+         raise ValueError("Not classes of scheme %s: %s" % (self.name, ", ".join(sorted(unknown))))
+      return [c for c in self.classes if c.name in names]
+
+   def remap(self, cls):
+      """[[code, value], ...] table of a class over all codes (for RemapValue)."""
+      return [[code, cls.weights.get(code, 0)] for code in self.codes]
+
+   def lut(self, classes, dtype=np.uint8):
+      """Dense LUT of 'classes' (reclass.build_lut): uint8 if the weights are integers up
+      to 254, float32 otherwise."""
+      from .reclass import build_lut
+      remaps = [self.remap(c) for c in classes]
+      if dtype == np.uint8:
+         try:
+            return build_lut(remaps, np.uint8)
+         except ValueError:
+            dtype = np.float32
+      return build_lut(remaps, dtype)
+
+   def max_weight(self, classes):
+      return max([0] + [v for c in classes for v in c.weights.values()])
+
+   def where_clause(self):
+      """SetNull where clause for the NoData codes (e.g. "Value = 0 OR Value = 1")."""
+      return " OR ".join("Value = %d" % c for c in self.nodata)
+
+   def to_dict(self):
+      return {"name": self.name, "prefix": self.prefix, "codes": self.codes, "nodata": self.nodata,
+              "classes": [c.to_dict() for c in self.classes]}
+
+   def key(self):
+      """Canonical JSON of the scheme (for run manifests and cache keys)."""
+      return json.dumps(self.to_dict(), sort_keys=True)
+
+   def __repr__(self):
+      return "Scheme(%r)" % self.name
+
+
+def _codes(text):
+   return [int(c) for c in text.split()]
+
+
+## NLCD 1992
+#11 = Open Water
+#12 = Perennial Ice/Snow
+#21 = Low Intensity Residential
+#22 = High Intensity Residential
+#23 = Commercial/Industrial/Transportation
+#31 = Bare Rock/Sand/Clay
+#32 = Quarries/Strip Mines/Gravel Pits
+#33 = Transitional Barren
+#41 = Deciduous Forest
+#42 = Evergreen Forest
+#43 = Mixed Forest
+#51 = Shrubland
+#61 = Orchards/Vineyards/Other
+#71 = Grassland/Herbaceous
+#81 = Pasture/Hay
+#82 = Row Crops
+#83 = Small Grains
+#84 = Fallow
+#85 = Urban/Recreational Grasses
+#91 = Woody Wetlands
+#92 = Emergent Herbaceous Wetlands
+# 2001 classes not in 1992 (allows use of a raster with a combination of both classification schemes):
+#24 = Developed High Intensity, 52 = Shrub/Scrub, 90 = Woody Wetlands, 95 = Emergent Herbaceous Wetlands
+NLCD1992 = Scheme("NLCD1992", _codes("11 12 21 22 23 31 32 33 41 42 43 51 61 71 81 82 83 84 85 91 92 24 52 90 95"), [
+   LandCoverClass("forest", {41: 1, 42: 1, 43: 1}, "mean_forest", default=False),
+   LandCoverClass("wetland", {91: 1, 92: 1, 90: 1, 95: 1}, "mean_wetland"),
+   # all barren, agricultural (including orchard [61]), not 85
+   LandCoverClass("open", {31: 1, 32: 1, 33: 1, 61: 1, 71: 1, 81: 1, 82: 1, 83: 1, 84: 1}, "mean_open"),
+   LandCoverClass("water", {11: 1}, "mean_water"),
+   LandCoverClass("shrubscrub", {51: 1, 52: 1}, "mean_shrubscrub"),
+   LandCoverClass("evergreen", {42: 1}, "mean_evergreen_n", default=False),
+   # mixed forest counts half
+   LandCoverClass("decidmix", {41: 100, 43: 50}, "mean_deciduous_mixed_n"),
+   LandCoverClass("evermix", {42: 100, 43: 50}, "mean_evergreen_mixed_n")],
+   nodata=[0], prefix="nlcd")
+
+## NLCD 2001, 2006, 2011...
+#11 = Open Water
+#12 = Perennial Ice/Snow
+#21 = Developed Open Space
+#22 = Developed Low Intensity
+#23 = Developed Medium Intensity
+#24 = Developed High Intensity
+#31 = Barren Land
+#41 = Deciduous Forest
+#42 = Evergreen Forest
+#43 = Mixed Forest
+#52 = Shrub/Scrub
+#71 = Grassland/Herbaceous
+#81 = Pasture/Hay
+#82 = Cultivated Crops
+#90 = Woody Wetlands
+#95 = Emergent Herbaceous Wetlands
+NLCD2001 = Scheme("NLCD2001", _codes("11 12 21 22 23 24 31 41 42 43 52 71 81 82 90 95"), [
+   LandCoverClass("forest", {41: 1, 42: 1, 43: 1}, "mean_forest", default=False),
+   LandCoverClass("wetland", {90: 1, 95: 1}, "mean_wetland"),
+   LandCoverClass("open", {31: 1, 71: 1, 81: 1, 82: 1}, "mean_open"),
+   LandCoverClass("water", {11: 1}, "mean_water"),
+   LandCoverClass("shrubscrub", {52: 1}, "mean_shrubscrub"),
+   LandCoverClass("evergreen", {42: 1}, "mean_evergreen_n", default=False),
+   LandCoverClass("decidmix", {41: 100, 43: 50}, "mean_deciduous_mixed_n"),
+   LandCoverClass("evermix", {42: 100, 43: 50}, "mean_evergreen_mixed_n")],
+   nodata=[0], prefix="nlcd")
+
+## CCAP
+#0 = background
+#1 = unclassified
+#2 = Developed High Intensity
+#3 = Developed Medium Intensity
+#4 = Developed Low Intensity
+#5 = Developed Open Space
+#6 = Cultivated Crops
+#7 = Pasture/Hay
+#8 = Grassland/Herbaceous
+#9 = Deciduous Forest
+#10 = Evergreen Forest
+#11 = Mixed Forest
+#12 = Shrub/Scrub
+#13 = Palustrine Forested Wetland **DIFFERENT FROM NLCD**
+#14 = Palustrine Scrub/Shrub wetland **DIFFERENT FROM NLCD**
+#15 = Palustrine Emergent Wetland (persistent) **DIFFERENT FROM NLCD**
+#16 = Estuarine Forested Wetland **DIFFERENT FROM NLCD**
+#17 = Esturaine Scrub/Shrub Wetland **DIFFERENT FROM NLCD**
+#18 = Estuarine Emergent Wetland **DIFFERENT FROM NLCD**
+#19 = Unconsolidated shore **DIFFERENT FROM NLCD**
+# Barren lands
+#20 = Barren Land
+#24 = Tundra
+#25 = Perennial Ice/Snow
+# Water/submerged lands
+#21 = Open Water
+#22 Palustrine Aquatic Bed **DIFFERENT FROM NLCD**
+#23 Estuarine Aquatic Bed **DIFFERENT FROM NLCD**
+CCAP = Scheme("CCAP", list(range(26)), [
+   LandCoverClass("forest", {9: 1, 10: 1, 11: 1}, "mean_forest", default=False),
+   LandCoverClass("open", {6: 1, 7: 1, 8: 1, 20: 1}, "mean_open"),
+   LandCoverClass("water", {21: 1}, "mean_water"),
+   LandCoverClass("shrubscrub", {12: 1}, "mean_shrubscrub"),
+   LandCoverClass("decidmix", {9: 100, 11: 50}, "mean_deciduous_mixed_n"),
+   LandCoverClass("evermix", {10: 100, 11: 50}, "mean_evergreen_mixed_n"),
+   ## CCAP-specific types
+   # unconsolidated shore / bare ground (19, 20)
+   LandCoverClass("bareshore", {19: 1, 20: 1}),
+   LandCoverClass("estwoody", {16: 1, 17: 1}),
+   LandCoverClass("palwoody", {13: 1, 14: 1}),
+   LandCoverClass("estherb", {18: 1, 23: 1}),
+   LandCoverClass("palherb", {15: 1, 22: 1})],
+   # 1 = unclassified
+   nodata=[0, 1], prefix="ccap")
+
+SCHEMES = {"NLCD1992": NLCD1992, "NLCD2001": NLCD2001, "CCAP": CCAP}
+
+
+def from_dict(d):
+   classes = [LandCoverClass(c["name"], c["weights"], c.get("basename"), c.get("default", True))
+              for c in d["classes"]]
+   return Scheme(d["name"], d["codes"], classes, d.get("nodata", [0]), d.get("prefix"))
+
+
+def load_scheme(path):
+   """Scheme from a JSON file (see Usage Tips)."""
+   with open(path) as f:
+      return from_dict(json.load(f))
+
+
+def get_scheme(name):
+   """Registered scheme 'name' (e.g. "NLCD2001"), or the scheme in JSON file 'name'."""
+   if name in SCHEMES:
+      return SCHEMES[name]
+   if os.path.exists(name):
+      return load_scheme(name)
+   raise ValueError("Unknown land cover scheme: %s (registered: %s)" % (name, ", ".join(sorted(SCHEMES))))
@@ -0,0 +1,155 @@
+# ----------------------------------------------------------------------------------------
+# store.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Folder of named raster layers kept as .npy files (opened as memmaps),
+# with a JSON sidecar (store.json) holding the shared georeference and, for
+# each layer, its file, band index and NoData value. A layer can be a whole
+# .npy file or one band of a multi-band file (e.g. the land cover summaries,
+# a (layers, neighborhoods, rows, cols) array), so stages can hand arrays to
+# each other without a raster round trip; reading a layer, a window of it
+# or values at points maps only those pages of the file. Layers are
+# exported to rasters (GeoTIFF, GDB) only when needed.
+
+# Usage Tips:
+# Float layers use NaN for NoData; integer layers record their NoData value,
+# and quantized layers their scale (sample() returns scaled values).
+# Layers returned by store[name] are read-only memmaps; open a file with
+# create() (or writable()) to write to it.
+
+# Dependencies:
+# numpy (arcpy for export)
+# ----------------------------------------------------------------------------------------
+
+import json
+import os
+
+import numpy as np
+
+from .arcpy_io import RasterRef
+
+# sidecar file name
+SIDECAR = "store.json"
+
+
+def is_store(folder):
+   """True if 'folder' holds a RasterStore."""
+   return os.path.exists(os.path.join(folder, SIDECAR))
+
+
+def split_layer(path):
+   """(store folder, layer name) if 'path' is '<store>/<layer>', a layer of a RasterStore; else None."""
+   folder, name = os.path.split(os.path.normpath(path))
+   if folder and is_store(folder) and name in RasterStore(folder):
+      return folder, name
+   return None
+
+
+class RasterStore(object):
+   """Layers on one grid ('ref', a RasterRef), in folder 'folder'. An existing store is
+   opened (its georeference is kept); otherwise 'ref' is required to create one."""
+
+   def __init__(self, folder, ref=None):
+      self.folder = folder
+      self.layers = {}
+      if is_store(folder):
+         with open(os.path.join(folder, SIDECAR)) as f:
+            data = json.load(f)
+         self.ref = RasterRef.from_dict(data["ref"])
+         self.layers = data["layers"]
+      elif ref is None:
+         raise ValueError("Not a raster store: " + folder)
+      else:
+         if not os.path.isdir(folder):
+            os.makedirs(folder)
+         self.ref = ref
+         self._save()
+      self.shape = (self.ref.rows, self.ref.cols)
+
+   def _save(self):
+      tmp = os.path.join(self.folder, SIDECAR + ".tmp")
+      with open(tmp, "w") as f:
+         json.dump({"ref": self.ref.to_dict(), "layers": self.layers}, f, indent=1, sort_keys=True)
+      if os.path.exists(os.path.join(self.folder, SIDECAR)):
+         os.remove(os.path.join(self.folder, SIDECAR))
+      os.rename(tmp, os.path.join(self.folder, SIDECAR))
+
+   def path(self, file):
+      return os.path.join(self.folder, file)
+
+   def create(self, file, dtype=np.float32, bands=()):
+      """New .npy file of shape bands + (rows, cols), opened for writing. Register its
+      bands as layers with register()."""
+      return np.lib.format.open_memmap(self.path(file), "w+", dtype, tuple(bands) + self.shape)
+
+   def writable(self, file):
+      """An existing file of the store, opened for writing."""
+      return np.load(self.path(file), mmap_mode="r+")
+
+   def register(self, name, file, index=(), nodata=None, scale=None):
+      """Make band 'index' of 'file' (or the whole file) available as layer 'name'.
+      'scale': value represented by one unit of a quantized (integer) layer."""
+      self.layers[name] = {"file": file, "index": list(index), "nodata": nodata, "scale": scale}
+      self._save()
+
+   def add(self, name, arr, dtype=None, nodata=None, tile_size=2048):
+      """Copy a 2D array-like (e.g. a lazy expression or RasterReader) into a new layer,
+      one tile at a time."""
+      from .tiles import iter_tiles
+      out = self.create(name + ".npy", dtype or getattr(arr, "dtype", np.float32))
+      for tile in iter_tiles(self.shape, tile_size):
+         out[tile.write_window] = arr[tile.write_window]
+      out.flush()
+      del out
+      self.register(name, name + ".npy", nodata=nodata)
+
+   def names(self):
+      return sorted(self.layers)
+
+   def __contains__(self, name):
+      return name in self.layers
+
+   def __getitem__(self, name):
+      """Layer 'name' as a read-only 2D memmap (no data is read until it is indexed)."""
+      layer = self.layers[name]
+      arr = np.load(self.path(layer["file"]), mmap_mode="r")
+      return arr[tuple(layer["index"])] if layer["index"] else arr
+
+   def nodata(self, name):
+      return self.layers[name]["nodata"]
+
+   def scale(self, name):
+      return self.layers[name].get("scale")
+
+   def cells(self, x, y):
+      """(rows, cols) of the cells holding map coordinates x, y (arrays); -1 outside the grid."""
+      ref = self.ref
+      cols = np.floor((np.asarray(x, dtype=np.float64) - ref.x_min) / ref.cell_width).astype(np.intp)
+      rows = ref.rows - 1 - np.floor((np.asarray(y, dtype=np.float64) - ref.y_min) / ref.cell_height).astype(np.intp)
+      outside = (rows < 0) | (rows >= ref.rows) | (cols < 0) | (cols >= ref.cols)
+      rows[outside] = -1
+      cols[outside] = -1
+      return rows, cols
+
+   def sample(self, names, x, y):
+      """Values of layers 'names' at points x, y, as a float64 (points, layers) array
+      (NaN for NoData and points outside the grid). Only the pages holding the points are read."""
+      rows, cols = self.cells(x, y)
+      inside = rows >= 0
+      out = np.full((len(rows), len(names)), np.nan)
+      for k, name in enumerate(names):
+         v = self[name][rows[inside], cols[inside]].astype(np.float64)
+         if self.nodata(name) is not None:
+            v[v == self.nodata(name)] = np.nan
+         if self.scale(name) is not None:
+            v *= self.scale(name)
+         out[inside, k] = v
+      return out
+
+   def export(self, name, out_raster):
+      """Save layer 'name' as a raster (GeoTIFF, GDB raster, ...). Returns the arcpy Raster."""
+      from .arcpy_io import write_raster
+      nodata = self.nodata(name)
+      return write_raster(self[name], self.ref, out_raster, -9999 if nodata is None else nodata)
@@ -0,0 +1,567 @@
+# ----------------------------------------------------------------------------------------
+# summarize.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# The land cover summary run behind reclassNLCD, reclassCCAP and
+# reclassLandCover, for any classification scheme (schemes.py) and any subset
+# of its classes: builds the processing extent and mask, clips and cleans the
+# classified raster (SetNull of the scheme's NoData codes) and the optional
+# impervious and canopy rasters, reclassifies each class, and saves the
+# neighborhood means (3x3 square, 10- and 100-cell circles, plus extra
+# neighborhoods with the NUMPY backend) of each class layer.
+# The NUMPY backend reclassifies all selected classes with one dense LUT
+# (Scheme.lut) as each tile is read, so extra classes only add their focal
+# means; the ARCPY backend runs Reclassify once per class.
+# summarize_files runs the NUMPY backend without arcpy, on GeoTIFF or .npy
+# rasters (raster_io.py), for the command line (cli.py); both runs share the
+# extent, cleaning and summary steps below.
+
+# Usage Tips:
+# Outputs are named <project>_<class basename>_<neighborhood suffix>; runs are
+# resumable (manifest.py) and the preprocessing can be cached (cache.py), as
+# in the tools. The NUMPY backend keeps its summaries array next to the
+# manifest (<project>_summaries.npy) until every output is saved, so a
+# resumed run only saves the outputs still missing.
+# For a new release of the land cover data, pass the previous classified
+# raster ('previous') to update the outputs of the earlier run of the same
+# project (incremental.py): only cells within reach of a changed cell are
+# recomputed. With geodatabase outputs the previous rasters are still read
+# and rewritten in full; with an array store the summaries are updated in
+# place. Run in full if the extent or mask changed, or if most of the area did.
+
+# Dependencies:
+# arcpy (Spatial Analyst for the ARCPY backend; without an extent: 3D Analyst), numpy
+# (summarize_files: numpy; GeoTIFFs: GDAL)
+# ----------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from . import (arcpy_io, cache, extent, finalize, incremental, instrument, landcover, lazy, manifest, parallel,
+               raster_io, store)
+
+# continuous layers summarized after the classes: (name, output basename)
+EXTRA_LAYERS = [("impervious", "mean_impervious_n"), ("canopy", "mean_canopy_n")]
+
+# error for an empty processing extent
+NO_EXTENT = "No data within the processing extent of %s: the extent, the mask and the classified data do not overlap"
+
+
+def numpy_extent(classified, cref, mask=None, extent_domain=None):
+   """Raster-domain processing extent (NUMPY backend) on the grid 'cref' of 'classified'
+   (a reader): the domains of 'extent_domain' (a boolean array; default: the non-zero
+   classified cells) and of 'mask' (a reader; default: the same), each buffered by
+   5000 m, intersected. Returns (window, extent) as extent.processing_extent."""
+   cells = 5000. / (cref.cell_width * cref.meters_per_unit())
+   data_domain = None
+   if extent_domain is None or mask is None:
+      data_domain = extent.domain(classified, zero_is_nodata=True)
+   if extent_domain is None:
+      extent_domain = data_domain
+   mask_domain = extent.domain(mask) if mask is not None else data_domain
+   return extent.processing_extent([extent_domain, mask_domain], cells)
+
+
+def _clean(scheme, classified, ext):
+   """Deferred clean classification (NUMPY backend): 'classified' (a reader on the run's
+   grid) within the extent, with the scheme's NoData codes set to NoData."""
+   cls = lazy.extract_by_mask(classified, ext)
+   null = lazy.equal_to(cls, scheme.nodata[0])
+   for code in scheme.nodata[1:]:
+      null = null + lazy.equal_to(cls, code)
+   return lazy.set_null(null, cls)
+
+
+def _default_mask(classified, ext):
+   """Deferred default mask (NUMPY backend), as the ARCPY backend's
+   SetNull(classified, classified, "Value = 0"): the non-zero cells of 'classified'
+   (a reader on the run's grid) within the extent."""
+   cls = lazy.extract_by_mask(classified, ext)
+   return lazy.set_null(lazy.equal_to(cls, 0), cls)
+
+
+def _clean_extras(impervious, canopy, clean):
+   """Deferred clean impervious (127 set to NoData) and canopy layers, where given
+   (readers on the run's grid), within the clean classification."""
+   extras = []
+   if impervious is not None:
+      imp = lazy.extract_by_mask(impervious, clean)
+      extras.append(lazy.set_null(lazy.equal_to(imp, 127), imp))
+   if canopy is not None:
+      extras.append(lazy.extract_by_mask(canopy, clean))
+   return extras
+
+
+def summary_type(scheme, classes, extras, quant_mult=None):
+   """(dtype, NoData value) of the summaries: float32, or with a multiplier the smallest
+   unsigned type for the class weights (and impervious/canopy percentages) up to 100."""
+   if not quant_mult:
+      return np.float32, -9999
+   hi = max(scheme.max_weight(classes), 100 if extras else 0)
+   return finalize.smallest_int_type(0, hi * quant_mult)
+
+
+def _summaries(classified, lut, nbrs, extras, mask, path, dtype, layer_names, workers=1, tile_size=2048,
+               quant_mult=None, scratch=None, trace=None, io_threads=False):
+   """Summaries of the deferred clean layers into a new (layers, neighborhoods, rows, cols)
+   .npy file 'path' (NUMPY backend): on a process pool with workers > 1 (staging the inputs
+   in folder 'scratch'), otherwise tile by tile in this process. 'io_threads': read on a
+   background thread (inputs that do not call arcpy). Returns it as a memmap."""
+   if trace is None:
+      trace = instrument.Tracer()
+   with trace.span("summaries") as span:
+      if workers > 1:
+         # one (layer x neighborhood) job per worker, sharing memmapped inputs
+         # (each job is timed in its worker and logged as a "focal" span)
+         summaries = parallel.summarize_parallel(classified, lut, nbrs, path, scratch, extras, mask,
+                                                 workers=workers, tile_size=tile_size, mult=quant_mult,
+                                                 dtype=dtype, tracer=trace, layer_names=layer_names,
+                                                 io_threads=io_threads)
+      else:
+         shape = np.shape(classified)
+         summaries = np.lib.format.open_memmap(path, "w+", dtype, (len(layer_names), len(nbrs)) + shape)
+         landcover.summarize_tiled(classified, lut, nbrs, summaries, extras, mask, tile_size=tile_size,
+                                   mult=quant_mult, io_threads=io_threads)
+      span.wrote(summaries.size, summaries.nbytes)
+   return summaries
+
+
+def _same_grid(a, b):
+   """True if RasterRefs 'a' and 'b' describe the same cells."""
+   return (a.rows, a.cols) == (b.rows, b.cols) and abs(a.x_min - b.x_min) < a.cell_width / 2. and \
+      abs(a.y_min - b.y_min) < a.cell_height / 2. and abs(a.cell_width - b.cell_width) < a.cell_width / 1e6
+
+
+def _previous_summaries(names, ref, path, dtype, nodata, outputs=None, tile_size=2048):
+   """Summaries array of the previous run, to update in place: the summaries file of the
+   array store 'outputs', or a new file 'path' holding the previous output rasters 'names'
+   ([layer][neighborhood]). Raises ValueError if they do not match this run's grid and layers."""
+   shape = (len(names), len(names[0]), ref.rows, ref.cols)
+   if outputs is not None:
+      if not os.path.exists(path) or not _same_grid(outputs.ref, ref):
+         raise ValueError("No previous summaries on this grid in " + outputs.folder)
+      summaries = outputs.writable(os.path.basename(path))
+      if summaries.shape != shape or summaries.dtype != np.dtype(dtype):
+         raise ValueError("The previous summaries (%s, %s) do not match this run (%s, %s)" %
+                          (summaries.shape, summaries.dtype, shape, np.dtype(dtype)))
+      return summaries
+   if not _same_grid(arcpy_io.RasterRef.from_raster(names[0][0]), ref):
+      raise ValueError("The previous outputs are not on this run's grid: " + names[0][0])
+   summaries = np.lib.format.open_memmap(path, "w+", dtype, shape)
+   for i, row in enumerate(names):
+      for j, name in enumerate(row):
+         reader = arcpy_io.RasterReader(name, ref)
+         for tile in landcover.iter_tiles(shape[2:], tile_size):
+            block = reader[tile.write_window]
+            if np.dtype(dtype).kind != "f":
+               block = np.where(np.isnan(block), nodata, block)
+            summaries[(i, j) + tile.write_window] = block
+   return summaries
+
+
+def summarize_land_cover(scheme, classes, out_folder, project_nm, classified, extent_shp=None,
+                         impervious_raster=None, canopy_raster=None, mask=None, backend="ARCPY",
+                         tile_size=2048, workers=1, extra_nbrs=(), cache_folder=None, store_folder=None,
+                         quant_mult=None, timing_log=None, previous=None, previous_impervious=None,
+                         previous_canopy=None):
+   """Summarize 'classes' (LandCoverClass list, e.g. scheme.select()) of the land cover
+   raster 'classified', classified with 'scheme', into <out_folder>/<project_nm>.gdb.
+   With 'previous' (the classified raster of an earlier run with the same project,
+   classes, extent and options), update that run's outputs instead, recomputing only
+   the cells within reach of a change (NUMPY backend). 'previous_impervious' and
+   'previous_canopy' default to the current impervious and canopy rasters."""
+   import arcpy
+   from arcpy.sa import Con, ExtractByMask, FocalStatistics, IsNull, NbrCircle, NbrRectangle, Reclassify, RemapValue, SetNull
+
+   if previous and backend != "NUMPY":
+      arcpy.AddMessage("Incremental update: using the NUMPY backend...")
+      backend = "NUMPY"
+   prefix = scheme.prefix
+   extra_nbrs = list(extra_nbrs)
+   trace = instrument.Tracer(timing_log, arcpy.AddMessage if timing_log else None)
+   # run manifest: a re-run with the same inputs and options resumes after the last completed stage
+   run = manifest.Manifest(os.path.join(out_folder, project_nm + "_manifest.json"),
+                           [cache.fingerprint(p) for p in (classified, impervious_raster, canopy_raster, mask, extent_shp,
+                                                           previous, previous_impervious, previous_canopy)] +
+                           [scheme.key(), [c.name for c in classes], backend, extra_nbrs, quant_mult], arcpy.Exists)
+   if run.resumed:
+      arcpy.AddMessage("Resuming the previous run (" + run.path + ")...")
+
+   # create new GDB
+   gdb = out_folder + os.sep + project_nm + ".gdb"
+   if not run.done("gdb"):
+      # (an update writes to the geodatabase of the previous run)
+      if not (previous and arcpy.Exists(gdb)):
+         arcpy.CreateFileGDB_management(out_folder, project_nm + ".gdb")
+      run.complete("gdb", [gdb])
+
+   # set environmental variables
+   # (the NUMPY backend runs without Spatial Analyst)
+   if backend != "NUMPY":
+      arcpy.CheckOutExtension("Spatial")
+   arcpy.env.workspace = gdb
+   arcpy.env.overwriteOutput = True
+
+   # preprocessed datasets (extent, mask, clipped and clean layers), from the cache if
+   # these inputs were processed before (the summary classes are not part of the key)
+   # (the NUMPY backend keeps the extent as a boolean array and saves no clipped or clean layers)
+   procextent = prefix + "procextent"
+   cliptemp = prefix + "_cliptemp"
+   in_class = prefix + "_classified_clean"
+   in_impervious = "nlcd_impervious_clean"
+   in_canopy = "nlcd_canopy_clean"
+   prep = []
+   if backend != "NUMPY":
+      prep.extend([procextent, "maskfinal", cliptemp, in_class])
+      if impervious_raster:
+         prep.append(in_impervious)
+      if canopy_raster:
+         prep.append(in_canopy)
+   prepared = bool(prep) and run.done("preprocess")
+   cached = None
+   if cache_folder and not prepared:
+      disk = cache.DiskCache(cache_folder)
+      key = cache.cache_key("landcover", scheme.where_clause(), backend, prep,
+                            *[cache.fingerprint(p) for p in (classified, impervious_raster, canopy_raster, mask, extent_shp)])
+      cached = disk.get(key)
+   if cached and backend == "NUMPY":
+      arcpy.AddMessage("Using cached extent (" + cached + ")...")
+      window, ext = extent.load(cached)
+   elif cached:
+      arcpy.AddMessage("Using cached preprocessing (" + cached + ")...")
+      for nm in prep:
+         arcpy.Copy_management(os.path.join(cached, "prep.gdb", nm), nm)
+      extent_shp = procextent
+      mask = "maskfinal"
+   elif prepared:
+      arcpy.AddMessage("Preprocessing already done...")
+      extent_shp = procextent
+      mask = "maskfinal"
+   cached = cached or prepared
+
+   if backend == "NUMPY":
+      # raster-domain extent (no polygons or 3D Analyst): the valid-data domains, buffered by
+      # 5000 m with a distance transform, intersected as boolean arrays on the classified grid
+      cref = arcpy_io.RasterRef.from_raster(classified)
+      if not cached:
+         arcpy.AddMessage("Computing the processing extent...")
+         with trace.span("extent") as span:
+            extent_domain = None
+            if extent_shp:
+               arcpy.env.snapRaster = classified
+               arcpy.env.extent = classified
+               arcpy.PolygonToRaster_conversion(extent_shp, arcpy.Describe(extent_shp).OIDFieldName, procextent + "grid", "CELL_CENTER", "", cref.cell_width)
+               extent_domain = extent.domain(arcpy_io.RasterReader(procextent + "grid", cref))
+               arcpy.Delete_management(procextent + "grid")
+               arcpy.ClearEnvironment("extent")
+            window, ext = numpy_extent(arcpy_io.RasterReader(classified, cref), cref,
+                                       arcpy_io.RasterReader(mask, cref) if mask else None, extent_domain)
+            del extent_domain
+            span.cells = cref.rows * cref.cols
+      if window is None:
+         raise ValueError(NO_EXTENT % classified)
+      # clipping is a window read of each input, masked by a view of the extent
+      ref = cref.subset(window)
+   elif not cached:
+      with trace.span("extent"):
+         if extent_shp:
+            extent_shp = arcpy.Buffer_analysis(extent_shp, procextent + "1", buffer_distance_or_field="5000 Meters", dissolve_option="ALL")
+         else:
+            e1 = SetNull(classified, classified, "Value = 0")
+            extent_shp = arcpy.RasterDomain_3d(e1, procextent + "1", "POLYGON")
+
+         if mask:
+            maskshp = arcpy.RasterDomain_3d(mask, procextent + "msk", "POLYGON")
+            maskshp = arcpy.Buffer_analysis(maskshp, procextent + "2", buffer_distance_or_field="5000 Meters", dissolve_option="ALL")
+            arcpy.Delete_management(procextent + "msk")
+         else:
+            mask = SetNull(classified, classified, "Value = 0")
+            maskshp = arcpy.RasterDomain_3d(mask, procextent + "2", "POLYGON")
+            maskshp = arcpy.Buffer_analysis(maskshp, procextent + "2", buffer_distance_or_field="5000 Meters", dissolve_option="ALL")
+
+         extent_shp = arcpy.Intersect_analysis([procextent + "1", procextent + "2"], procextent)
+         arcpy.Delete_management(procextent + "1")
+         arcpy.Delete_management(procextent + "2")
+
+      with trace.span("clip", output="maskfinal") as span:
+         mask = arcpy.Clip_management(mask, "#", "maskfinal", extent_shp, "#", "ClippingGeometry")
+         span.wrote(*arcpy_io.raster_size("maskfinal"))
+
+   if backend != "NUMPY":
+      arcpy.env.snapRaster = "maskfinal"
+
+   # clean (clip and set null) rasters
+   # classified
+   arcpy.AddMessage("Clipping " + scheme.name + "...")
+   if backend != "NUMPY" and not cached:
+      with trace.span("clip", output=cliptemp) as span:
+         arcpy.Clip_management(classified, "#", cliptemp, extent_shp, "#", "ClippingGeometry")
+         span.wrote(*arcpy_io.raster_size(cliptemp))
+   if backend == "NUMPY":
+      # deferred: the clean rasters are evaluated tile by tile in the summaries (never saved)
+      reader = arcpy_io.RasterReader(classified, ref)
+      deferred = {in_class: _clean(scheme, reader, ext)}
+      # maskfinal: the mask (default: the non-zero classified cells) within the extent
+      maskfinal = lazy.extract_by_mask(arcpy_io.RasterReader(mask, ref), ext) if mask else _default_mask(reader, ext)
+   elif not cached:
+      with trace.span("SetNull", output=in_class) as span:
+         SetNull(cliptemp, cliptemp, scheme.where_clause()).save(in_class)
+         span.wrote(*arcpy_io.raster_size(in_class))
+
+   # impervious
+   if impervious_raster:
+      arcpy.AddMessage("Clipping impervious raster...")
+      if backend == "NUMPY":
+         deferred[in_impervious] = _clean_extras(arcpy_io.RasterReader(impervious_raster, ref), None,
+                                                 deferred[in_class])[0]
+      elif not cached:
+         with trace.span("ExtractByMask", output=in_impervious):
+            outsetNull = ExtractByMask(impervious_raster, in_class)
+         with trace.span("SetNull", output=in_impervious) as span:
+            outsetNull = SetNull(outsetNull, outsetNull, "Value = 127")
+            outsetNull.save(in_impervious)
+            span.wrote(*arcpy_io.raster_size(in_impervious))
+
+   # canopy
+   if canopy_raster:
+      arcpy.AddMessage("Clipping canopy raster...")
+      if backend == "NUMPY":
+         deferred[in_canopy] = _clean_extras(None, arcpy_io.RasterReader(canopy_raster, ref), deferred[in_class])[0]
+      elif not cached:
+         with trace.span("ExtractByMask", output=in_canopy) as span:
+            outsetNull = ExtractByMask(canopy_raster, in_class)
+            outsetNull.save(in_canopy)
+            span.wrote(*arcpy_io.raster_size(in_canopy))
+
+   if cache_folder and not cached:
+      def build(folder):
+         if backend == "NUMPY":
+            extent.save(folder, window, ext)
+            return
+         arcpy.CreateFileGDB_management(folder, "prep.gdb")
+         for nm in prep:
+            arcpy.Copy_management(nm, os.path.join(folder, "prep.gdb", nm))
+      disk.put(key, build, info=prep)
+   if prep and not prepared:
+      run.complete("preprocess", prep)
+
+   # reclass the classified raster for each class
+   # (NUMPY backend: class layers are made per tile, in memory, by one LUT in the summaries)
+   arcpy.AddMessage("Reclassifying...")
+   if backend != "NUMPY":
+      for c in classes:
+         out_reclassify = project_nm + "_b_" + c.name + "_n"
+         if run.done(out_reclassify):
+            continue
+         with trace.span("Reclassify", output=out_reclassify) as span:
+            Reclassify(in_class, "Value", RemapValue(scheme.remap(c)), "NODATA").save(out_reclassify)
+            span.wrote(*arcpy_io.raster_size(out_reclassify))
+         run.complete(out_reclassify, [out_reclassify])
+   arcpy.AddMessage("Done reclassifying")
+
+   # layers to summarize (class layers, then impervious and canopy) and their output basenames
+   proj_source = [project_nm + "_b_" + c.name + "_n" for c in classes]
+   basenames = [c.basename for c in classes]
+   for (nm, basename), raster, layer in zip(EXTRA_LAYERS, (impervious_raster, canopy_raster), (in_impervious, in_canopy)):
+      if raster:
+         proj_source.append(layer)
+         basenames.append(basename)
+
+   if backend == "NUMPY":
+      # reclass, focal means, Con(IsNull()) and mask for all layers, one tile at a time
+      # (tiles overlap by the largest neighborhood, so results match the untiled rasters)
+      extras = [deferred[r] for r in proj_source[len(classes):]]
+      nbr_list = landcover.neighborhoods(extra_nbrs)
+      nbrs = [nbr for sfx, nbr in nbr_list]
+      outputs = None
+      if store_folder:
+         outputs = store.RasterStore(os.path.join(store_folder, project_nm), ref)
+         summaries_file = outputs.path(project_nm + "_summaries.npy")
+      else:
+         # (next to the run manifest, so that a resumed run reuses it; removed once every output is saved)
+         summaries_file = os.path.join(out_folder, project_nm + "_summaries.npy")
+      out_names = [parallel.output_name(project_nm, b, sfx) for b in basenames for sfx, nbr in nbr_list]
+      # class layers as uint8 where the weights allow (exact integer window sums)
+      lut = scheme.lut(classes)
+      sum_dtype, sum_nodata = summary_type(scheme, classes, extras, quant_mult)
+      # cells updated per neighborhood (incremental update)
+      updated = None
+      if outputs is None and not previous and all(run.done(nm) for nm in out_names):
+         # every output was saved by an earlier run
+         arcpy.AddMessage("Summaries already saved...")
+         summaries = None
+      elif run.done("summaries") and os.path.exists(summaries_file):
+         arcpy.AddMessage("Using the summaries of the previous run (" + summaries_file + ")...")
+         summaries = np.load(summaries_file, mmap_mode="r")
+      elif previous:
+         # the previous outputs, updated where a changed cell is within reach
+         names = [[parallel.output_name(project_nm, b, sfx) for sfx, nbr in nbr_list] for b in basenames]
+         with trace.span("previous outputs"):
+            summaries = _previous_summaries(names, ref, summaries_file, sum_dtype, sum_nodata, outputs, tile_size)
+         old_class = _clean(scheme, arcpy_io.RasterReader(previous, ref), ext)
+         old_extras = _clean_extras(arcpy_io.RasterReader(previous_impervious or impervious_raster, ref)
+                                    if impervious_raster else None,
+                                    arcpy_io.RasterReader(previous_canopy or canopy_raster, ref)
+                                    if canopy_raster else None, old_class)
+         arcpy.AddMessage("Comparing with the previous classification...")
+         with trace.span("changes") as span:
+            rows, cols = incremental.changed_cells(old_class, deferred[in_class], lut, old_extras, extras,
+                                                   tile_size=tile_size)
+            span.cells = ref.rows * ref.cols
+         arcpy.AddMessage("%d changed cells" % len(rows))
+         with trace.span("update") as span:
+            updated = incremental.update_tiled(deferred[in_class], lut, nbrs, summaries, rows, cols,
+                                               extras, maskfinal, mult=quant_mult)
+            span.cells = sum(updated)
+         for (sfx, nbr), n in zip(nbr_list, updated):
+            arcpy.AddMessage("Neighborhood " + sfx + ": %d cells updated" % n)
+      else:
+         summaries = _summaries(deferred[in_class], lut, nbrs, extras, maskfinal, summaries_file, sum_dtype,
+                                proj_source, workers, tile_size, quant_mult, arcpy.env.scratchFolder, trace)
+      if summaries is not None and not run.done("summaries"):
+         summaries.flush()
+         run.complete("summaries", [summaries_file])
+
+   neighborhoods = [("1", NbrRectangle(3, 3, "CELL"), "1 cell square"),
+                    ("10", NbrCircle(10, "CELL"), "10 cell circle"),
+                    ("100", NbrCircle(100, "CELL"), "100 cell circle")]
+
+   for i, (raster, basename) in enumerate(zip(proj_source, basenames)):
+      arcpy.AddMessage("Calculating focal statistics for " + basename + "...")
+      if backend == "NUMPY":
+         for j, (sfx, nbr) in enumerate(nbr_list):
+            out_raster = parallel.output_name(project_nm, basename, sfx)
+            if outputs is not None:
+               # band (i, j) of the summaries file (export with exportRasterStore)
+               outputs.register(out_raster, os.path.basename(summaries_file), (i, j),
+                                None if not quant_mult else sum_nodata,
+                                None if not quant_mult else 1. / quant_mult)
+            elif updated is not None and not updated[j]:
+               # (unchanged by the update)
+               continue
+            elif not run.done(out_raster):
+               with trace.span("save", output=out_raster) as span:
+                  arcpy_io.write_raster(summaries[i, j], ref, out_raster, sum_nodata)
+                  span.wrote(*arcpy_io.raster_size(out_raster))
+               run.complete(out_raster, [out_raster])
+         arcpy.AddMessage("Finished with " + basename + ".")
+         continue
+      for sfx, nbr, label in neighborhoods:
+         out_raster = parallel.output_name(project_nm, basename, sfx)
+         if run.done(out_raster):
+            continue
+         arcpy.AddMessage("Calculating neighborhood " + label)
+         with trace.span("neighborhood", output=out_raster):
+            with trace.span("FocalStatistics", output=out_raster) as span:
+               outFocal = FocalStatistics(raster, nbr, "MEAN", "DATA")
+               span.cells = arcpy_io.raster_size(raster)[0]
+            with trace.span("Con", output=out_raster):
+               outFocal = Con(IsNull(outFocal), 0, outFocal)
+            with trace.span("ExtractByMask", output=out_raster):
+               outFocal = ExtractByMask(outFocal, mask)
+            with trace.span("save", output=out_raster) as span:
+               outFocal.save(out_raster)
+               span.wrote(*arcpy_io.raster_size(out_raster))
+         run.complete(out_raster, [out_raster])
+         arcpy.AddMessage("Finished with neighborhood " + label)
+      arcpy.AddMessage("Finished with " + basename + ".")
+
+   ## clean up
+   if arcpy.Exists("maskfinal"):
+      arcpy.Delete_management("maskfinal")
+   if backend != "NUMPY":
+      arcpy.Delete_management(procextent)
+      arcpy.Delete_management(cliptemp)
+   if backend == "NUMPY":
+      # (all outputs are saved and recorded in the manifest by now)
+      del summaries
+      if outputs is None and os.path.exists(summaries_file):
+         os.remove(summaries_file)
+
+   # timing summary (with a timing log)
+   trace.report()
+
+
+def _print(msg):
+   print(msg)
+
+
+def summarize_files(scheme, classes, out_folder, project_nm, classified, impervious_raster=None, canopy_raster=None,
+                    mask=None, tile_size=2048, workers=1, extra_nbrs=(), output_format="tif", quant_mult=None,
+                    timing_log=None, message=None):
+   """The NUMPY backend of summarize_land_cover without arcpy, for GeoTIFF or .npy rasters
+   (raster_io.py) on the grid of 'classified' (processing extent from the data and the
+   mask; no extent polygons). Writes <out_folder>/<project_nm>_<basename>_<suffix>.tif
+   (output_format "tif", or .npy with "npy"), or registers the outputs in the array
+   store <out_folder>/<project_nm> ("store"). 'message' (default: print) reports
+   progress. Returns the output names."""
+   if message is None:
+      message = _print
+   trace = instrument.Tracer(timing_log, message if timing_log else None)
+   cref = raster_io.raster_ref(classified)
+   message("Computing the processing extent...")
+   with trace.span("extent") as span:
+      window, ext = numpy_extent(raster_io.RasterReader(classified, cref), cref,
+                                 raster_io.RasterReader(mask, cref) if mask else None)
+      span.cells = cref.rows * cref.cols
+   if window is None:
+      raise ValueError(NO_EXTENT % classified)
+   ref = cref.subset(window)
+
+   # deferred clean layers, evaluated tile by tile in the summaries
+   reader = raster_io.RasterReader(classified, ref)
+   clean = _clean(scheme, reader, ext)
+   maskfinal = lazy.extract_by_mask(raster_io.RasterReader(mask, ref), ext) if mask else _default_mask(reader, ext)
+   extras = _clean_extras(raster_io.RasterReader(impervious_raster, ref) if impervious_raster else None,
+                          raster_io.RasterReader(canopy_raster, ref) if canopy_raster else None, clean)
+   basenames = [c.basename for c in classes] + [basename for (nm, basename), raster in
+                                                zip(EXTRA_LAYERS, (impervious_raster, canopy_raster)) if raster]
+   nbr_list = landcover.neighborhoods(extra_nbrs)
+   nbrs = [nbr for sfx, nbr in nbr_list]
+   lut = scheme.lut(classes)
+   sum_dtype, sum_nodata = summary_type(scheme, classes, extras, quant_mult)
+
+   if not os.path.isdir(out_folder):
+      os.makedirs(out_folder)
+   outputs = None
+   if output_format == "store":
+      outputs = store.RasterStore(os.path.join(out_folder, project_nm), ref)
+      summaries_file = outputs.path(project_nm + "_summaries.npy")
+   else:
+      summaries_file = os.path.join(out_folder, project_nm + "_summaries.npy")
+   message("Summarizing %d layers in %d neighborhoods..." % (len(basenames), len(nbrs)))
+   scratch = tempfile.mkdtemp(dir=out_folder) if workers > 1 else None
+   try:
+      # (raster_io readers, no arcpy: tiles are read on a thread of their own)
+      summaries = _summaries(clean, lut, nbrs, extras, maskfinal, summaries_file, sum_dtype, basenames,
+                             workers, tile_size, quant_mult, scratch, trace, io_threads=True)
+   finally:
+      if scratch:
+         shutil.rmtree(scratch, ignore_errors=True)
+
+   names = []
+   for i, basename in enumerate(basenames):
+      for j, (sfx, nbr) in enumerate(nbr_list):
+         out_raster = parallel.output_name(project_nm, basename, sfx)
+         if outputs is not None:
+            # band (i, j) of the summaries file
+            outputs.register(out_raster, os.path.basename(summaries_file), (i, j),
+                             None if not quant_mult else sum_nodata,
+                             None if not quant_mult else 1. / quant_mult)
+         else:
+            with trace.span("save", output=out_raster) as span:
+               raster_io.write_raster(summaries[i, j], ref, os.path.join(out_folder, out_raster + "." + output_format),
+                                      sum_nodata, tile_size)
+               span.wrote(summaries[i, j].size, summaries[i, j].nbytes)
+         names.append(out_raster)
+      message("Finished with " + basename + ".")
+   del summaries
+   if outputs is None:
+      os.remove(summaries_file)
+   trace.report()
+   return names
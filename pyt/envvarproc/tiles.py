@@ -0,0 +1,55 @@
+# ----------------------------------------------------------------------------------------
+# tiles.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Splits a raster extent into tiles with a halo (overlap) so that neighborhood
+# operations can be run one tile at a time. A tile reads its interior plus
+# 'halo' cells on each side (clipped to the raster), and writes back only its
+# interior, so results are the same as processing the whole raster at once
+# as long as the halo is at least the neighborhood reach.
+
+# Dependencies:
+# none
+# ----------------------------------------------------------------------------------------
+
+
+class Tile(object):
+   """One tile: interior window (row0:row1, col0:col1) and read window with halo."""
+
+   def __init__(self, row0, row1, col0, col1, shape, halo):
+      self.row0, self.row1, self.col0, self.col1 = row0, row1, col0, col1
+      # read window, clipped to the raster
+      self.read_row0 = max(row0 - halo, 0)
+      self.read_row1 = min(row1 + halo, shape[0])
+      self.read_col0 = max(col0 - halo, 0)
+      self.read_col1 = min(col1 + halo, shape[1])
+
+   @property
+   def read_window(self):
+      """(rows, cols) slices of the raster read for this tile (interior + halo)."""
+      return (slice(self.read_row0, self.read_row1), slice(self.read_col0, self.read_col1))
+
+   @property
+   def write_window(self):
+      """(rows, cols) slices of the raster written for this tile (interior)."""
+      return (slice(self.row0, self.row1), slice(self.col0, self.col1))
+
+   @property
+   def inner(self):
+      """(rows, cols) slices of the interior within a block read with read_window."""
+      r0 = self.row0 - self.read_row0
+      c0 = self.col0 - self.read_col0
+      return (slice(r0, r0 + self.row1 - self.row0), slice(c0, c0 + self.col1 - self.col0))
+
+   def __repr__(self):
+      return "Tile(rows %d:%d, cols %d:%d)" % (self.row0, self.row1, self.col0, self.col1)
+
+
+def iter_tiles(shape, tile_size, halo=0):
+   """Yield Tiles covering an array of 'shape' (rows, cols), row by row."""
+   rows, cols = shape
+   for r in range(0, rows, tile_size):
+      for c in range(0, cols, tile_size):
+         yield Tile(r, min(r + tile_size, rows), c, min(c + tile_size, cols), shape, halo)
@@ -0,0 +1,65 @@
+# ----------------------------------------------------------------------------------------
+# test_fill.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# The distance transform behind the fills (fill.edt, and its numpy version
+# _edt_numpy) must give the exact distance to the nearest data cell, with
+# indices of a data cell at that distance, as a brute-force search does.
+
+# Usage Tips:
+# From the pyt folder: python -m pytest -q tests
+
+# Dependencies:
+# numpy, pytest
+# ----------------------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from envvarproc.fill import _edt_numpy, edt
+
+
+def _brute(valid):
+   """Distance from every cell to the nearest True cell, over all pairs of cells."""
+   rows, cols = np.indices(valid.shape)
+   dr = rows[..., None] - rows[valid]
+   dc = cols[..., None] - cols[valid]
+   return np.sqrt(dr ** 2 + dc ** 2).min(axis=-1)
+
+
+def _grids():
+   rs = np.random.RandomState(7)
+   yield rs.rand(31, 23) < .05
+   yield rs.rand(17, 40) < .5
+   one = np.zeros((25, 19), dtype=bool)
+   one[24, 0] = True
+   yield one
+   # columns without data
+   cols = np.zeros((20, 30), dtype=bool)
+   cols[rs.rand(20) < .3, 11] = True
+   cols[3, 27] = True
+   yield cols
+
+
+@pytest.mark.parametrize("func", [edt, _edt_numpy], ids=["edt", "numpy"])
+def test_edt_matches_brute_force(func):
+   for valid in _grids():
+      dist, (r, c) = func(valid)
+      rows, cols = np.indices(valid.shape)
+      assert np.array_equal(dist, _brute(valid))
+      assert valid[r, c].all()
+      assert np.allclose(np.hypot(rows - r, cols - c), dist)
+
+
+def test_edt_numpy_strips():
+   for valid in _grids():
+      dist, (r, c) = _edt_numpy(valid, strip_cells=valid.shape[1] * 3)
+      assert np.array_equal(dist, _brute(valid))
+      assert valid[r, c].all()
+
+
+def test_edt_no_data():
+   dist = edt(np.zeros((4, 5), dtype=bool))[0]
+   assert np.isinf(dist).all()
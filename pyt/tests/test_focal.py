@@ -0,0 +1,97 @@
+# ----------------------------------------------------------------------------------------
+# test_focal.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Focal means from summed-area tables (focal_mean, focal_means and Pyramid) must
+# match the brute-force focal_mean_reference for rectangle and circle
+# neighborhoods, with scattered NoData cells and windows running off the raster
+# edges: same values, and NaN in the same cells.
+
+# Usage Tips:
+# From the pyt folder: python -m pytest -q tests
+
+# Dependencies:
+# numpy, pytest
+# ----------------------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from envvarproc import benchmark
+from envvarproc.focal import (Circle, Pyramid, Rectangle, focal_mean, focal_mean_reference, focal_means,
+                              neighborhood_suffix, valid_mask)
+
+SHAPE = (61, 47)
+NBRS = [Rectangle(1, 1), Rectangle(3, 3), Rectangle(6, 4), Rectangle(1, 9), Circle(1), Circle(2.5), Circle(7),
+        Circle(40)]
+NODATA = -9999.
+
+
+def _values(dtype=np.float64):
+   """Float surface with scattered NaN cells and holes larger than the smaller windows."""
+   arr = benchmark.gappy(SHAPE, nodata=.2, gap=5, seed=4)
+   arr[np.random.RandomState(5).rand(*SHAPE) < .1] = np.nan
+   return arr.astype(dtype)
+
+
+def _check(got, want):
+   assert np.array_equal(np.isnan(got), np.isnan(want))
+   assert np.allclose(got, want, rtol=1e-12, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("nbr", NBRS, ids=neighborhood_suffix)
+def test_focal_mean_matches_reference(nbr):
+   arr = _values()
+   _check(focal_mean(arr, nbr), focal_mean_reference(arr, nbr))
+
+
+@pytest.mark.parametrize("nbr", NBRS, ids=neighborhood_suffix)
+def test_focal_mean_nodata_value(nbr):
+   # integer layer with a NoData value instead of NaN
+   arr = np.where(np.isnan(_values()), NODATA, np.round(np.nan_to_num(_values()) * 10)).astype(np.int32)
+   _check(focal_mean(arr, nbr, NODATA), focal_mean_reference(arr, nbr, NODATA))
+
+
+def test_all_nodata_window_is_nan():
+   arr = np.full((9, 9), np.nan)
+   arr[0, 0] = 3.
+   got = focal_mean(arr, Rectangle(3, 3))
+   _check(got, focal_mean_reference(arr, Rectangle(3, 3)))
+   assert got[1, 1] == 3. and np.isnan(got[2, 2])
+
+
+def test_pyramid_matches_reference():
+   # several layers sharing one NoData pattern, read from one table per layer
+   arr = _values()
+   valid = valid_mask(arr)
+   pyramid = Pyramid(valid, NBRS)
+   for layer in (arr, np.where(valid, arr * -3.5 + 1., np.nan), valid.astype(np.uint8)):
+      masked = np.where(valid, layer, np.nan)
+      for got, nbr in zip(pyramid.means(layer), NBRS):
+         _check(got, focal_mean_reference(masked, nbr))
+   arr = _values(np.float32)
+   for got, nbr in zip(focal_means(arr, NBRS), NBRS):
+      _check(got, focal_mean_reference(arr, nbr))
+
+
+@pytest.mark.parametrize("scale", [1e-7, 1e-30, 1e12])
+def test_float_scale(scale):
+   # fixed-point sums are scaled to the layer's largest value, so tiny and huge values keep their precision
+   arr = np.where(np.isnan(_values()), np.nan, np.random.RandomState(6).rand(*SHAPE) * scale)
+   for nbr in (Circle(3), Rectangle(6, 4)):
+      got, want = focal_mean(arr, nbr), focal_mean_reference(arr, nbr)
+      assert np.array_equal(np.isnan(got), np.isnan(want))
+      assert np.allclose(got, want, rtol=1e-9, atol=0, equal_nan=True)
+
+
+def test_float_blocks_share_scale():
+   # a block given the whole layer's largest value sums at the layer's scale
+   arr = _values() * 1e-7
+   big = np.nanmax(np.abs(arr))
+   whole = focal_mean(arr, Circle(3))
+   block = focal_mean(arr[:20, :20], Circle(3), big=big)
+   assert np.array_equal(block[:17, :17], whole[:17, :17], equal_nan=True)
+   with pytest.raises(ValueError):
+      focal_mean(arr, Circle(3), big=big / 2)
@@ -0,0 +1,70 @@
+# ----------------------------------------------------------------------------------------
+# test_incremental.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Summaries updated for changed inputs (incremental.changed_cells and
+# update_tiled) must equal summarize_block on the new inputs, for a changed
+# patch of classes (recomputed over a box), scattered changed cells
+# (recomputed at those cells) and a changed float layer.
+
+# Usage Tips:
+# From the pyt folder: python -m pytest -q tests
+
+# Dependencies:
+# numpy, pytest
+# ----------------------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from envvarproc import benchmark
+from envvarproc.focal import Circle, Rectangle
+from envvarproc.incremental import changed_cells, update_tiled
+from envvarproc.landcover import summarize_block
+
+SHAPE = (240, 210)
+NBRS = [Rectangle(3, 3), Circle(10), Circle(25.5)]
+
+
+def _inputs():
+   classes = benchmark.classified(SHAPE, seed=11)
+   fraction = (benchmark.gappy(SHAPE, nodata=.1, gap=32, seed=12) * 7.31 + 100.) / 3.
+   mask = np.where(benchmark.gappy(SHAPE, nodata=.15, gap=48, seed=13) > -5, 1., np.nan)
+   return classes, fraction.astype(np.float32), mask
+
+
+def _changed(classes, fraction):
+   """New inputs: a patch of classes recoded, a few scattered cells, and part of the float layer."""
+   rs = np.random.RandomState(14)
+   new, frac = classes.copy(), fraction.copy()
+   new[60:90, 100:140] = 41
+   new[rs.randint(0, SHAPE[0], 6), rs.randint(0, SHAPE[1], 6)] = 82
+   frac[150:160, 20:30] += 1.5
+   frac[200, 5] = np.nan
+   return new, frac
+
+
+@pytest.mark.parametrize("mult,dtype,tile_size", [(None, np.float32, 64), (None, np.float32, 512),
+                                                  (100, np.uint16, 64)])
+def test_update_equals_full_run(mult, dtype, tile_size):
+   classes, fraction, mask = _inputs()
+   lut = benchmark.scheme_lut("NLCD2001")
+   out = summarize_block(classes, lut, NBRS, [fraction], mask, mult=mult, dtype=dtype)
+   new, frac = _changed(classes, fraction)
+   rows, cols = changed_cells(classes, new, lut, [fraction], [frac], tile_size=tile_size)
+   assert len(rows)
+   updated = update_tiled(new, lut, NBRS, out, rows, cols, [frac], mask, tile_size=tile_size, mult=mult)
+   assert 0 < max(updated) < np.prod(SHAPE)
+   whole = summarize_block(new, lut, NBRS, [frac], mask, mult=mult, dtype=dtype)
+   assert np.array_equal(out, whole, equal_nan=True)
+
+
+def test_no_change():
+   classes, fraction, mask = _inputs()
+   lut = benchmark.scheme_lut("NLCD2001")
+   rows, cols = changed_cells(classes, classes.copy(), lut, [fraction], [fraction.copy()])
+   assert not len(rows)
+   out = summarize_block(classes, lut, NBRS, [fraction], mask)
+   assert update_tiled(classes, lut, NBRS, out, rows, cols, [fraction], mask) == [0] * len(NBRS)
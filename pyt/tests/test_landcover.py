@@ -0,0 +1,56 @@
+# ----------------------------------------------------------------------------------------
+# test_landcover.py
+# Version:  Python 2.7 / 3.x
+# Creation Date: 2026-10-17
+
+# Summary:
+# Tiled land cover summaries (landcover.summarize_tiled) must be bit-identical
+# to the untiled summarize_block, for uint8 class layers and for integer and
+# float extra layers, on synthetic rasters (benchmark.py).
+
+# Usage Tips:
+# From the pyt folder: python -m pytest -q tests
+
+# Dependencies:
+# numpy, pytest
+# ----------------------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+
+from envvarproc import benchmark
+from envvarproc.focal import Circle, Rectangle
+from envvarproc.landcover import summarize_block, summarize_tiled
+
+SHAPE = (300, 260)
+NBRS = [Rectangle(3, 3), Circle(10), Circle(25.5), Rectangle(6, 4)]
+
+
+def _inputs():
+   classes = benchmark.classified(SHAPE, seed=1)
+   surface = benchmark.gappy(SHAPE, nodata=.1, gap=32, seed=2)
+   # integer percent layer (summed as uint8) and float layer (summed in fixed point)
+   percent = np.round(np.abs(surface) * 3) % 101
+   fraction = (surface * 7.31 + 100.) / 3.
+   mask = np.where(benchmark.gappy(SHAPE, nodata=.15, gap=48, seed=3) > -5, 1., np.nan)
+   return classes, [percent, fraction.astype(np.float32)], mask
+
+
+@pytest.mark.parametrize("tile_size", [37, 64, 128, 1000])
+def test_tiled_equals_untiled(tile_size):
+   classes, extras, mask = _inputs()
+   lut = benchmark.scheme_lut("NLCD2001")
+   whole = summarize_block(classes, lut, NBRS, extras, mask)
+   out = np.empty_like(whole)
+   summarize_tiled(classes, lut, NBRS, out, extras, mask, tile_size=tile_size)
+   assert np.array_equal(out, whole, equal_nan=True)
+
+
+@pytest.mark.parametrize("workers,depth", [(1, 0), (2, 2)])
+def test_tiled_quantized_equals_untiled(workers, depth):
+   classes, extras, mask = _inputs()
+   lut = benchmark.scheme_lut("NLCD2001")
+   whole = summarize_block(classes, lut, NBRS, extras, mask, mult=100, dtype=np.uint16)
+   out = np.empty_like(whole)
+   summarize_tiled(classes, lut, NBRS, out, extras, mask, tile_size=50, mult=100, workers=workers, depth=depth)
+   assert np.array_equal(out, whole)